@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Vose alias tables for O(1) weighted name selection.
+
+Per-name weights live under assets/data/weights/, one file per region/gender
+named like its name file, in the {"firstNames": {name: weight},
+"lastNames": {...}} format that bulk_generate --weights reads (names without
+a weight count 1.0). The build stage turns every weighted list into a Vose
+alias table, a probability and an alias array, and writes them all to one
+sidecar. A draw is one uniform index and one comparison however many
+candidates the list has, and AliasTable.sample() draws whole batches with
+NumPy.
+"""
+
+import argparse
+import os
+import random
+
+import numpy as np
+
+from asset_io import (
+    ASSETS_DIR,
+    INDEX_DIR,
+    NAME_LISTS,
+    NAMES_DIR,
+    content_hash,
+    iter_name_files,
+    load_json,
+    name_file_name,
+    write_json,
+)
+
+WEIGHTS_DIR = os.path.join(ASSETS_DIR, "weights")
+ALIAS_TABLES_PATH = os.path.join(INDEX_DIR, "alias_tables.json")
+ALIAS_VERSION = 1
+
+
+def load_weights(weights_path, first_names, last_names):
+    """Load {"firstNames": {name: weight}, "lastNames": {...}} into aligned vectors.
+
+    Names missing from the weights file get weight 1.0; returns (first, last)
+    probability vectors, either of which is None when that list is unweighted.
+    """
+    data = load_json(weights_path)
+    vectors = []
+    for list_name, names in (("firstNames", first_names), ("lastNames", last_names)):
+        weights = data.get(list_name)
+        if not weights:
+            vectors.append(None)
+            continue
+        vector = np.array([float(weights.get(name, 1.0)) for name in names])
+        if (vector < 0).any() or vector.sum() <= 0:
+            raise ValueError(f"Weights for {list_name} must be non-negative with a positive total")
+        vectors.append(vector / vector.sum())
+    return tuple(vectors)
+
+
+class AliasTable:
+    """Walker/Vose alias table over 0..n-1."""
+
+    def __init__(self, probability, alias):
+        self.probability = np.asarray(probability, dtype=np.float64)
+        self.alias = np.asarray(alias, dtype=np.int64)
+        # Plain lists for single draws, where NumPy scalar indexing would dominate
+        self._probability = self.probability.tolist()
+        self._alias = self.alias.tolist()
+
+    @classmethod
+    def from_weights(cls, weights):
+        """Build a table from non-negative weights with a positive total (Vose's method)."""
+        weights = np.asarray(weights, dtype=np.float64)
+        count = len(weights)
+        total = weights.sum()
+        if count == 0 or (weights < 0).any() or not total > 0:
+            raise ValueError("Weights must be non-negative with a positive total")
+        scaled = (weights * (count / total)).tolist()
+        probability = [1.0] * count
+        alias = list(range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            # The large entry gives up what fills the small one's column
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error
+        return cls(probability, alias)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["probability"], data["alias"])
+
+    def to_json(self):
+        return {"probability": self._probability, "alias": self._alias}
+
+    def __len__(self):
+        return len(self._alias)
+
+    def draw(self, rng=random):
+        """Draw one index with a random.Random-style generator."""
+        index = rng.randrange(len(self._alias))
+        return index if rng.random() < self._probability[index] else self._alias[index]
+
+    def sample(self, rng, size):
+        """Draw size indices at once with a NumPy Generator."""
+        indices = rng.integers(len(self._alias), size=size)
+        return np.where(rng.random(size) < self.probability[indices], indices, self.alias[indices])
+
+    def probabilities(self):
+        """Return the distribution the table encodes, for checking it against its weights."""
+        count = len(self._alias)
+        distribution = self.probability / count
+        np.add.at(distribution, self.alias, (1.0 - self.probability) / count)
+        return distribution
+
+
+def _list_hash(names):
+    return content_hash("\n".join(names))
+
+
+def build_alias_tables(names_dir=NAMES_DIR, weights_dir=WEIGHTS_DIR):
+    """Build the alias tables of every name list that has weight data; returns the sidecar data."""
+    tables = {}
+    for file_path in iter_name_files(names_dir):
+        weights_path = os.path.join(weights_dir, file_path.name)
+        if not os.path.exists(weights_path):
+            continue
+        data = load_json(file_path)
+        lists = {list_name: data.get(list_name, []) for list_name in NAME_LISTS}
+        vectors = load_weights(weights_path, lists["firstNames"], lists["lastNames"])
+        file_tables = {}
+        for (list_name, names), vector in zip(lists.items(), vectors):
+            if vector is None:
+                continue
+            entry = AliasTable.from_weights(vector).to_json()
+            entry["listHash"] = _list_hash(names)
+            file_tables[list_name] = entry
+        if file_tables:
+            tables[file_path.stem] = file_tables
+    return {"version": ALIAS_VERSION, "tables": tables}
+
+
+def write_alias_tables(names_dir=NAMES_DIR, weights_dir=WEIGHTS_DIR, tables_path=ALIAS_TABLES_PATH):
+    """Build and write the alias table sidecar; returns the sidecar data."""
+    data = build_alias_tables(names_dir, weights_dir)
+    os.makedirs(os.path.dirname(tables_path), exist_ok=True)
+    write_json(tables_path, data, compact=True)
+    if not data["tables"]:
+        print(f"[INFO] No weight files for the name lists in {weights_dir}")
+    for stem, file_tables in data["tables"].items():
+        sizes = ", ".join(f"{list_name} ({len(table['alias'])})" for list_name, table in file_tables.items())
+        print(f"Built alias tables for {stem}: {sizes}")
+    print(f"[OK] Wrote {tables_path}")
+    return data
+
+
+def load_alias_tables(pool, tables_path=ALIAS_TABLES_PATH):
+    """Return the (first, last) AliasTables of a NamePool, either None when that list is unweighted.
+
+    Raises ValueError if a table was built for a different version of the list.
+    """
+    data = load_json(tables_path)
+    if data.get("version") != ALIAS_VERSION:
+        raise ValueError(f"Unsupported alias table version in {tables_path}")
+    stem = os.path.splitext(name_file_name(pool.region, pool.gender))[0]
+    file_tables = data["tables"].get(stem, {})
+    tables = []
+    for list_name, names in (("firstNames", pool.first_names), ("lastNames", pool.last_names)):
+        entry = file_tables.get(list_name)
+        if entry is None:
+            tables.append(None)
+            continue
+        if entry["listHash"] != _list_hash(names):
+            raise ValueError(f"Alias table for {stem} {list_name} is stale; rebuild it")
+        tables.append(AliasTable.from_json(entry))
+    return tuple(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build alias tables for weighted name selection.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--weights-dir", default=WEIGHTS_DIR, help="directory containing per-file weights")
+    parser.add_argument("--output", default=ALIAS_TABLES_PATH, help="path of the alias table sidecar")
+    args = parser.parse_args()
+
+    try:
+        write_alias_tables(args.names_dir, args.weights_dir, args.output)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+
+
+if __name__ == "__main__":
+    main()
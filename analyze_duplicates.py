@@ -3,33 +3,39 @@
 Script to analyze and remove duplicates from Sims 4 name generator JSON files.
 """
 
-import json
+import argparse
 import os
 from pathlib import Path
 from collections import Counter
 
+from asset_io import load_json, load_json_bytes, write_json
+from pipeline_profile import add_profile_arguments, phase, run_profiled, track_file
+from snapshot_store import SnapshotStore
+
+DEFAULT_NAMES_DIR = "C:/Users/Dean/Dev/sims 4 app/sims4_name_generator/assets/data/names"
+
 def analyze_name_file(file_path):
     """Analyze a single name file for duplicates."""
     print(f"\n=== Analyzing {os.path.basename(file_path)} ===")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(file_path)
         
         # Check structure
         if 'firstNames' not in data or 'lastNames' not in data:
             print(f"[ERROR] Invalid structure in {file_path}")
             return None
         
-        # Analyze first names
-        first_names = data['firstNames']
-        first_name_counts = Counter(first_names)
-        first_duplicates = {name: count for name, count in first_name_counts.items() if count > 1}
-        
-        # Analyze last names  
-        last_names = data['lastNames']
-        last_name_counts = Counter(last_names)
-        last_duplicates = {name: count for name, count in last_name_counts.items() if count > 1}
+        with phase("dedupe"):
+            # Analyze first names
+            first_names = data['firstNames']
+            first_name_counts = Counter(first_names)
+            first_duplicates = {name: count for name, count in first_name_counts.items() if count > 1}
+            
+            # Analyze last names  
+            last_names = data['lastNames']
+            last_name_counts = Counter(last_names)
+            last_duplicates = {name: count for name, count in last_name_counts.items() if count > 1}
         
         print(f"Region: {data.get('region', 'unknown')}")
         print(f"Gender: {data.get('gender', 'unknown')}")
@@ -62,28 +68,24 @@ def analyze_name_file(file_path):
         print(f"[ERROR] Error processing {file_path}: {str(e)}")
         return None
 
-def remove_duplicates_from_file(file_path, backup=True):
-    """Remove duplicates from a name file while preserving order."""
+def remove_duplicates_from_file(file_path, backup=True, store=None):
+    """Remove duplicates from a name file while preserving order.
+
+    The original is snapshotted into store (the default SnapshotStore when None).
+    """
     print(f"\n=== Cleaning duplicates from {os.path.basename(file_path)} ===")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Backup original file
-        if backup:
-            backup_path = str(file_path).replace('.json', '_backup.json')
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"[OK] Backup created: {os.path.basename(backup_path)}")
+        raw, data = load_json_bytes(file_path)
         
         # Remove duplicates while preserving order
         original_first = len(data['firstNames'])
         original_last = len(data['lastNames'])
         
         # Use dict.fromkeys() to preserve order while removing duplicates
-        data['firstNames'] = list(dict.fromkeys(data['firstNames']))
-        data['lastNames'] = list(dict.fromkeys(data['lastNames']))
+        with phase("dedupe"):
+            data['firstNames'] = list(dict.fromkeys(data['firstNames']))
+            data['lastNames'] = list(dict.fromkeys(data['lastNames']))
         
         cleaned_first = len(data['firstNames'])
         cleaned_last = len(data['lastNames'])
@@ -91,11 +93,17 @@ def remove_duplicates_from_file(file_path, backup=True):
         print(f"First names: {original_first} -> {cleaned_first} (removed {original_first - cleaned_first})")
         print(f"Last names: {original_last} -> {cleaned_last} (removed {original_last - cleaned_last})")
         
-        # Save cleaned file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Snapshot the original before overwriting it, unless nothing was removed
+        if backup and (cleaned_first != original_first or cleaned_last != original_last):
+            store = store or SnapshotStore()
+            snapshot = store.snapshot_contents({file_path: raw}, "remove_duplicates_from_file")
+            print(f"[OK] Snapshot saved: {snapshot['id']}")
         
-        print(f"[OK] File cleaned and saved")
+        # Save cleaned file; an already clean file is left untouched
+        if write_json(file_path, data):
+            print(f"[OK] File cleaned and saved")
+        else:
+            print("[OK] No changes, file left untouched")
         
         return {
             'first_removed': original_first - cleaned_first,
@@ -108,27 +116,177 @@ def remove_duplicates_from_file(file_path, backup=True):
         print(f"[ERROR] Error cleaning {file_path}: {str(e)}")
         return None
 
-def main():
+def find_duplicates(names):
+    """Return (names without duplicates in order, {name: count} for repeated names)."""
+    unique_names = set(names)
+    if len(unique_names) == len(names):
+        # Fast path: one C-level set build and no per-name Python work
+        return names, {}
+
+    seen = set()
+    cleaned = []
+    duplicates = {}
+    for name in names:
+        if name in seen:
+            duplicates[name] = duplicates.get(name, 1) + 1
+        else:
+            seen.add(name)
+            cleaned.append(name)
+    return cleaned, duplicates
+
+def analyze_and_fix_file(file_path, backup=True, store=None):
+    """Analyze a name file and remove its duplicates in a single read.
+
+    The file is read and parsed once, duplicates are found with one hash set per
+    list and, only when something was removed, the bytes already read are
+    snapshotted into store (the default SnapshotStore when None) and the file
+    is rewritten.
+    """
+    print(f"\n=== Analyzing and cleaning {os.path.basename(file_path)} ===")
+    
+    try:
+        raw, data = load_json_bytes(file_path)
+        
+        if 'firstNames' not in data or 'lastNames' not in data:
+            print(f"[ERROR] Invalid structure in {file_path}")
+            return None
+        
+        original_first = len(data['firstNames'])
+        original_last = len(data['lastNames'])
+        
+        with phase("dedupe"):
+            data['firstNames'], first_duplicates = find_duplicates(data['firstNames'])
+            data['lastNames'], last_duplicates = find_duplicates(data['lastNames'])
+        
+        cleaned_first = len(data['firstNames'])
+        cleaned_last = len(data['lastNames'])
+        changed = cleaned_first != original_first or cleaned_last != original_last
+        
+        print(f"Region: {data.get('region', 'unknown')}")
+        print(f"Gender: {data.get('gender', 'unknown')}")
+        print(f"First names: {original_first} -> {cleaned_first} (removed {original_first - cleaned_first})")
+        print(f"Last names: {original_last} -> {cleaned_last} (removed {original_last - cleaned_last})")
+        
+        if changed:
+            if backup:
+                store = store or SnapshotStore()
+                snapshot = store.snapshot_contents({file_path: raw}, "analyze_and_fix_file")
+                print(f"[OK] Snapshot saved: {snapshot['id']}")
+            
+            write_json(file_path, data)
+            print(f"[OK] File cleaned and saved")
+        else:
+            print("[OK] No duplicates, file left untouched")
+        
+        return {
+            'file_path': file_path,
+            'region': data.get('region'),
+            'gender': data.get('gender'),
+            'first_names_total': original_first,
+            'first_names_unique': cleaned_first,
+            'last_names_total': original_last,
+            'last_names_unique': cleaned_last,
+            'first_duplicates': first_duplicates,
+            'last_duplicates': last_duplicates,
+            'first_removed': original_first - cleaned_first,
+            'last_removed': original_last - cleaned_last,
+            'changed': changed
+        }
+    
+    except Exception as e:
+        print(f"[ERROR] Error processing {file_path}: {str(e)}")
+        return None
+
+def single_pass(json_files):
+    """Analyze and clean every file with one read per file."""
+    files_with_issues = 0
+    total_first_removed = 0
+    total_last_removed = 0
+    processed = 0
+    # One store for the run, so its snapshot log is read once rather than per file
+    store = SnapshotStore()
+    
+    # Only per-file totals are kept, so peak memory is one file's worth of names
+    for file_path in sorted(json_files):
+        with track_file(file_path):
+            result = analyze_and_fix_file(file_path, store=store)
+        if not result:
+            continue
+        processed += 1
+        if result['changed']:
+            files_with_issues += 1
+            total_first_removed += result['first_removed']
+            total_last_removed += result['last_removed']
+    
+    print("\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+    
+    if files_with_issues == 0:
+        print("[OK] No duplicate names found in any files!")
+        return
+    
+    print(f"Files cleaned: {files_with_issues}/{processed}")
+    print(f"Duplicate first names removed: {total_first_removed}")
+    print(f"Duplicate last names removed: {total_last_removed}")
+
+def normalized_pass(names_dir, steps):
+    """Report names that only differ by Unicode form, case or diacritics (read-only)."""
+    from normalized_duplicates import NormalizedDuplicateIndex, NormalizedKey, report
+    
+    try:
+        key = NormalizedKey([step.strip() for step in steps.split(",") if step.strip()])
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return
+    index = NormalizedDuplicateIndex.build(names_dir, key)
+    groups = list(index.groups())
+    
+    print("\n" + "="*60)
+    print("NORMALIZATION VARIANTS")
+    print("="*60)
+    by_step = report(groups)
+    
+    if not groups:
+        print("[OK] No normalization variants found in any files!")
+        return
+    print(f"\nVariant groups: {len(groups)} "
+          f"({', '.join(f'{count} merged by {step}' for step, count in by_step.items())})")
+    print("[INFO] Variants are reported only; review them before editing the lists.")
+
+def analyze_names_dir(args):
+    """Analyze (and clean) every name file in args.names_dir."""
     # Path to name files
-    names_dir = Path("C:/Users/Dean/Dev/sims 4 app/sims4_name_generator/assets/data/names")
+    names_dir = Path(args.names_dir)
     
     if not names_dir.exists():
         print(f"[ERROR] Directory not found: {names_dir}")
         return
     
     # Find all JSON files
-    json_files = list(names_dir.glob("*.json"))
+    json_files = [path for path in names_dir.glob("*.json") if not path.name.endswith('_backup.json')]
     
     if not json_files:
         print(f"[ERROR] No JSON files found in {names_dir}")
         return
     
+    if args.normalized:
+        print(f"Found {len(json_files)} name files to check for normalization variants")
+        normalized_pass(names_dir, args.normalize_steps)
+        return
+    
+    if args.single_pass:
+        print(f"Found {len(json_files)} name files to analyze and clean")
+        single_pass(json_files)
+        return
+    
     print(f"Found {len(json_files)} name files to analyze")
     
     # Analyze all files first
     analysis_results = []
     for file_path in sorted(json_files):
-        result = analyze_name_file(file_path)
+        with track_file(file_path):
+            result = analyze_name_file(file_path)
         if result:
             analysis_results.append(result)
     
@@ -168,8 +326,10 @@ def main():
         print("="*60)
         
         total_removed = 0
+        store = SnapshotStore()
         for file_path in sorted(json_files):
-            result = remove_duplicates_from_file(file_path)
+            with track_file(file_path):
+                result = remove_duplicates_from_file(file_path, store=store)
             if result:
                 total_removed += result['first_removed'] + result['last_removed']
         
@@ -178,5 +338,18 @@ def main():
     else:
         print("[INFO] Duplicate removal cancelled.")
 
+def main():
+    parser = argparse.ArgumentParser(description="Analyze and remove duplicate names.")
+    parser.add_argument("--names-dir", default=DEFAULT_NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="analyze and clean each file with a single read, writing only changed files")
+    parser.add_argument("--normalized", action="store_true",
+                        help="report names that only differ by Unicode form, case or diacritics")
+    parser.add_argument("--normalize-steps", default="nfc,casefold,strip",
+                        help="normalization chain for --normalized (nfc, nfkc, casefold, strip)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    run_profiled("analyze_duplicates", args, analyze_names_dir, args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for reading and writing the Sims 4 Name Generator asset files.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from pipeline_profile import phase, record_file
+
+# Asset locations, relative to the repository root like every generator script
+ASSETS_DIR = os.path.join("sims4_name_generator", "assets", "data")
+NAMES_DIR = os.path.join(ASSETS_DIR, "names")
+TRAITS_DIR = os.path.join(ASSETS_DIR, "traits")
+
+# Build sidecars (indexes, binary pools) live outside the bundled asset folders
+INDEX_DIR = os.path.join(ASSETS_DIR, "index")
+
+BACKUP_SUFFIX = "_backup.json"
+
+# The name lists of every name file, in the order indexes number them
+NAME_LISTS = ("firstNames", "lastNames")
+
+# Existing files are compared against new content in chunks of this size
+COMPARE_CHUNK = 1 << 16
+
+
+def name_file_name(region, gender):
+    """Return the file name used for a region/gender name file."""
+    return f"{region}_{gender}.json"
+
+
+def name_payload(region, gender, first_names, last_names):
+    """Build a name file payload the same way generate_name_files() does."""
+    return {
+        "region": region.replace("_", ""),
+        "gender": gender,
+        "firstNames": first_names,
+        "lastNames": last_names
+    }
+
+
+def dedupe_names(names):
+    """Remove duplicates from a name list while preserving order."""
+    return list(dict.fromkeys(names))
+
+
+def serialize_json(data, compact=False):
+    """Serialize data exactly like the generators' json.dump(..., indent=2) calls.
+
+    compact=True drops all whitespace, for machine-read sidecars.
+    """
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of a str or bytes value."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_json(file_path):
+    """Load a UTF-8 JSON file."""
+    with phase("load"):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    record_file(file_path, len(text.encode('utf-8')), "read")
+    with phase("parse"):
+        return json.loads(text)
+
+
+def load_json_bytes(file_path):
+    """Load a UTF-8 JSON file; returns (raw bytes, data) for callers that also keep the bytes."""
+    with phase("load"):
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    record_file(file_path, len(raw), "read")
+    with phase("parse"):
+        return raw, json.loads(raw)
+
+
+def same_content(file_path, data):
+    """Check whether a file already holds exactly these bytes, without reading it whole."""
+    try:
+        if os.path.getsize(file_path) != len(data):
+            return False
+    except OSError:
+        return False
+    view = memoryview(data)
+    offset = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(COMPARE_CHUNK)
+            if not chunk:
+                return offset == len(data)
+            if view[offset:offset + len(chunk)] != chunk:
+                return False
+            offset += len(chunk)
+
+
+def write_atomic(file_path, data):
+    """Write bytes through a temp file, fsync and rename, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    # Persist the rename itself; Windows can't open directories for fsync
+    if os.name != "nt":
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_bytes(file_path, data):
+    """Atomically write bytes unless the file already holds them; returns whether it was written."""
+    with phase("compare"):
+        if same_content(file_path, data):
+            return False
+    with phase("write"):
+        write_atomic(file_path, data)
+    record_file(file_path, len(data), "written")
+    return True
+
+
+def write_json(file_path, data, compact=False):
+    """Serialize data to a UTF-8 JSON file, skipping unchanged files; returns whether it was written."""
+    with phase("serialize"):
+        encoded = serialize_json(data, compact).encode('utf-8')
+    return write_bytes(file_path, encoded)
+
+
+def split_name_file_stem(stem):
+    """Split a file stem like 'north_african_male' into ('north_african', 'male')."""
+    region, _, gender = stem.rpartition("_")
+    return region, gender
+
+
+def iter_name_files(names_dir=NAMES_DIR):
+    """Yield every region/gender name file in sorted order, skipping backups."""
+    for file_path in sorted(Path(names_dir).glob("*.json")):
+        if not file_path.name.endswith(BACKUP_SUFFIX):
+            yield file_path
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the asset builders and duplicate analyzers.
+
+Every benchmark runs in a fresh process inside a scratch directory, so peak
+RSS is per benchmark and the real assets are never touched. Each one is run
+at the real data size and at scaled sizes, where every name list is repeated
+with numbered suffixes (keeping the original duplicate pattern), and results
+are written to a JSON file that can be compared between runs. Traits are
+scaled the same way, each copy conflicting only with traits of its own copy,
+and the trait sidecars are benchmarked separately from traits.json.
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from queue import Empty
+
+from asset_io import NAMES_DIR, iter_name_files, load_json, serialize_json
+
+try:
+    import resource
+except ImportError:
+    # Unix only; peak RSS is reported as unavailable elsewhere (e.g. Windows)
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = "benchmark_results.json"
+
+SIZES = {"real": 1, "10x": 10, "1000x": 1000}
+# Seconds between checks that a benchmark process is still alive
+POLL_INTERVAL = 1.0
+
+# (benchmark name, module, function)
+BUILDERS = [
+    ("generate_name_files", "generate_names", "generate_name_files"),
+    ("generate_remaining_region_files", "generate_remaining_regions", "generate_remaining_region_files"),
+    ("generate_traits_file", "generate_traits", "generate_traits_file"),
+    ("expand_east_asian_files", "expand_east_asian_names", "expand_east_asian_files"),
+    ("expand_south_asian_files", "expand_south_asian_names", "expand_south_asian_files"),
+    ("expand_middle_eastern_files", "expand_middle_eastern_names", "expand_middle_eastern_files"),
+    ("expand_northern_european_files", "expand_remaining_regions", "expand_northern_european_files"),
+    ("expand_oceania_files", "expand_remaining_regions", "expand_oceania_files"),
+]
+# Built from the traits list, which is scaled like the name lists
+TRAIT_SIDECARS = [
+    ("write_trait_index", "trait_index", "write_trait_index"),
+    ("write_trait_postings", "trait_postings", "write_trait_postings"),
+    ("write_combination_table", "trait_combinations", "write_combination_table"),
+]
+# Benchmark name -> why only the real data size is run
+REAL_SIZE_ONLY = {
+    "write_combination_table": "combination tables list every valid trait set, which grows as C(n, 3)",
+}
+ANALYZERS = [
+    ("analyze_name_file", "analyze_duplicates", "analyze_name_file"),
+    ("remove_duplicates_from_file", "analyze_duplicates", "remove_duplicates_from_file"),
+    ("analyze_and_fix_file", "analyze_duplicates", "analyze_and_fix_file"),
+]
+
+
+def scale_name(name, copy):
+    """Return the copy-th scaled variant of a name (copy 0 is the name itself)."""
+    if copy == 0:
+        return name
+    # Suffix every word so surname extraction by split() still sees new names
+    return " ".join(f"{part}{copy}" for part in name.split(" "))
+
+
+def scale_names(names, factor):
+    """Repeat a name list factor times with numbered suffixes."""
+    return [scale_name(name, copy) for copy in range(factor) for name in names]
+
+
+def _scale_value(value, factor):
+    if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+        return scale_names(value, factor)
+    if isinstance(value, dict):
+        return {key: _scale_value(item, factor) for key, item in value.items()}
+    return value
+
+
+def scale_traits(traits, factor):
+    """Repeat a traits list factor times with numbered suffixes on IDs, names and conflicts."""
+    return [
+        dict(trait, id=scale_name(trait["id"], copy), name=scale_name(trait["name"], copy),
+             conflictingTraits=[scale_name(trait_id, copy) for trait_id in trait.get("conflictingTraits", [])])
+        for copy in range(factor) for trait in traits
+    ]
+
+
+def scale_module_data(module, factor):
+    """Scale every module-level name list (and nested name tables) in place."""
+    for attr, value in list(vars(module).items()):
+        if attr == "TRAITS_DATA":
+            setattr(module, attr, dict(value, traits=scale_traits(value["traits"], factor)))
+        elif attr.isupper():
+            setattr(module, attr, _scale_value(value, factor))
+
+
+def write_scaled_name_files(output_dir, factor, names_dir):
+    """Write scaled copies of every real name file for the analyzers."""
+    os.makedirs(output_dir, exist_ok=True)
+    for file_path in iter_name_files(names_dir):
+        data = load_json(file_path)
+        data["firstNames"] = scale_names(data["firstNames"], factor)
+        data["lastNames"] = scale_names(data["lastNames"], factor)
+        with open(os.path.join(output_dir, file_path.name), 'w', encoding='utf-8') as f:
+            f.write(serialize_json(data))
+
+
+def _count_names(directory):
+    total = 0
+    for file_path in iter_name_files(directory):
+        data = load_json(file_path)
+        total += len(data.get("firstNames", [])) + len(data.get("lastNames", []))
+    return total
+
+
+def _max_rss_kb():
+    """Return this process's peak RSS in KiB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _run_case(kind, module_name, function_name, factor, names_dir, queue):
+    """Child process body: run one benchmark case and report its measurements."""
+    import importlib
+    import inspect
+
+    sys.path.insert(0, REPO_ROOT)
+    scratch = tempfile.mkdtemp(prefix="sims4_bench_")
+    try:
+        os.chdir(scratch)
+        module = importlib.import_module(module_name)
+        function = getattr(module, function_name)
+        output_dir = os.path.join(scratch, NAMES_DIR)
+
+        if kind == "builder":
+            scale_module_data(module, factor)
+            os.makedirs(output_dir, exist_ok=True)
+            os.makedirs(os.path.join(scratch, "sims4_name_generator", "assets", "data", "traits"), exist_ok=True)
+            calls = [()]
+            # The trait sidecars are benchmarked on their own
+            options = {"sidecars": False} if "sidecars" in inspect.signature(function).parameters else {}
+        elif kind == "sidecar":
+            traits = scale_traits(importlib.import_module("generate_traits").TRAITS_DATA["traits"], factor)
+            calls = [(traits,)]
+            options = {}
+        else:
+            write_scaled_name_files(output_dir, factor, names_dir)
+            calls = [(file_path,) for file_path in iter_name_files(output_dir)]
+            input_names = _count_names(output_dir)
+            # Snapshots would go to the repo's store and add their I/O to the timings
+            options = {"backup": False} if "backup" in inspect.signature(function).parameters else {}
+
+        baseline_rss = _max_rss_kb()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            for args in calls:
+                function(*args, **options)
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - start
+        peak_rss = _max_rss_kb()
+
+        if module_name == "generate_traits":
+            names = len(module.TRAITS_DATA["traits"])
+        elif kind == "sidecar":
+            names = len(traits)
+        elif kind == "builder":
+            names = _count_names(output_dir)
+        else:
+            names = input_names
+
+        queue.put({
+            "status": "ok",
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "names": names,
+            "names_per_s": names / wall if wall else None,
+            "peak_rss_kb": peak_rss,
+            "baseline_rss_kb": baseline_rss
+        })
+    except Exception as e:
+        queue.put({"status": "error", "reason": str(e)})
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def run_case(kind, module_name, function_name, factor, names_dir):
+    """Run one benchmark case in a fresh process and return its measurements."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_case,
+                              args=(kind, module_name, function_name, factor, os.path.abspath(names_dir), queue))
+    process.start()
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=POLL_INTERVAL)
+        except Empty:
+            if not process.is_alive():
+                break
+    if result is None:
+        # The child is gone; a result it put just before exiting may still be in the pipe
+        try:
+            result = queue.get(timeout=POLL_INTERVAL)
+        except Empty:
+            process.join()
+            result = {"status": "failed", "exit_code": process.exitcode,
+                      "reason": f"benchmark process exited with code {process.exitcode} before reporting"}
+    process.join()
+    return result
+
+
+def run_benchmarks(sizes=tuple(SIZES), only=None, names_dir=NAMES_DIR, output_path=RESULTS_PATH):
+    """Run every selected benchmark at every selected size and write the results."""
+    cases = [(name, module, function, "builder") for name, module, function in BUILDERS]
+    cases += [(name, module, function, "sidecar") for name, module, function in TRAIT_SIDECARS]
+    cases += [(name, module, function, "analyzer") for name, module, function in ANALYZERS]
+    if only:
+        cases = [case for case in cases if case[0] in only]
+
+    results = []
+    print(f"{'benchmark':<34}{'size':>7}{'wall s':>10}{'names/s':>14}{'peak RSS MiB':>14}")
+    for size in sizes:
+        for name, module, function, kind in cases:
+            if SIZES[size] > 1 and name in REAL_SIZE_ONLY:
+                result = {"status": "skipped", "reason": REAL_SIZE_ONLY[name]}
+            else:
+                result = run_case(kind, module, function, SIZES[size], names_dir)
+            result.update({"benchmark": name, "kind": kind, "size": size, "factor": SIZES[size]})
+            results.append(result)
+            if result["status"] == "ok":
+                peak_rss = result["peak_rss_kb"]
+                rss_column = f"{peak_rss / 1024:>14.1f}" if peak_rss is not None else f"{'n/a':>14}"
+                print(f"{name:<34}{size:>7}{result['wall_s']:>10.3f}{result['names_per_s']:>14,.0f}{rss_column}")
+            else:
+                print(f"{name:<34}{size:>7}  [{result['status'].upper()}] {result['reason']}")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] Results written to {output_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asset builders and analyzers.")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma-separated sizes to run ({', '.join(SIZES)})")
+    parser.add_argument("--only", nargs="+", help="benchmark names to run (default: all)")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="real name files to scale for the analyzers")
+    parser.add_argument("--output", default=RESULTS_PATH, help="path of the JSON results file")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    run_benchmarks(sizes, args.only, args.names_dir, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Unified incremental build for the Sims 4 Name Generator name assets.
+
+Every generator and expand script is registered here as a name source, in the
+order the scripts used to be run by hand; a later source overrides an earlier
+one for the same region/gender file. A content-hash manifest records what each
+output was built from, so only outputs whose inputs changed are rewritten and
+unchanged files keep their mtimes. With --jobs the files whose inputs changed
+are deduped, serialized and written in a process pool; results are collected
+in target order, so output and manifest are identical to a serial build.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_io import (
+    NAMES_DIR,
+    content_hash,
+    dedupe_names,
+    load_json,
+    name_file_name,
+    name_payload,
+    serialize_json,
+    write_bytes,
+    write_json,
+)
+from pipeline_profile import add_profile_arguments, phase, run_profiled, track_file
+
+MANIFEST_PATH = ".asset_manifest.json"
+
+# Bump when the output format changes so every file is rebuilt once
+BUILD_VERSION = 1
+
+
+def _dict_payloads(data):
+    """Turn a {region: {gender: names}} table into payloads keyed by (region, gender)."""
+    return {
+        (region, gender): name_payload(region, gender, names["firstNames"], names["lastNames"])
+        for region, genders in data.items()
+        for gender, names in genders.items()
+    }
+
+
+def _pair_payloads(region, data_func):
+    """Turn an expand script's (female, male) payload pair into keyed payloads."""
+    female_data, male_data = data_func()
+    return {(region, "female"): female_data, (region, "male"): male_data}
+
+
+def _generate_names_source():
+    from generate_names import NAME_DATA
+    return _dict_payloads(NAME_DATA)
+
+
+def _generate_remaining_regions_source():
+    from generate_remaining_regions import REMAINING_REGIONS_DATA
+    return _dict_payloads(REMAINING_REGIONS_DATA)
+
+
+def _expand_east_asian_source():
+    from expand_east_asian_names import east_asian_name_data
+    return _pair_payloads("eastAsian", east_asian_name_data)
+
+
+def _expand_south_asian_source():
+    from expand_south_asian_names import south_asian_name_data
+    return _pair_payloads("southAsian", south_asian_name_data)
+
+
+def _expand_middle_eastern_source():
+    from expand_middle_eastern_names import middle_eastern_name_data
+    return _pair_payloads("middleEastern", middle_eastern_name_data)
+
+
+def _expand_northern_european_source():
+    from expand_remaining_regions import northern_european_name_data
+    return _pair_payloads("northernEuropean", northern_european_name_data)
+
+
+def _expand_oceania_source():
+    from expand_remaining_regions import oceania_name_data
+    return _pair_payloads("oceania", oceania_name_data)
+
+
+# Name sources in precedence order (later entries win)
+NAME_SOURCES = [
+    ("generate_names", _generate_names_source),
+    ("generate_remaining_regions", _generate_remaining_regions_source),
+    ("expand_east_asian_names", _expand_east_asian_source),
+    ("expand_south_asian_names", _expand_south_asian_source),
+    ("expand_middle_eastern_names", _expand_middle_eastern_source),
+    ("expand_northern_european_names", _expand_northern_european_source),
+    ("expand_oceania_names", _expand_oceania_source),
+]
+
+
+def collect_targets():
+    """Map each output (region, gender) to the (source name, payload) that wins it.
+
+    Every source is computed exactly once; build_target works from the payload.
+    """
+    targets = {}
+    for source_name, source_func in NAME_SOURCES:
+        for key, payload in source_func().items():
+            targets[key] = (source_name, payload)
+    return dict(sorted(targets.items()))
+
+
+def input_hash(payload):
+    """Hash a source payload together with the build version."""
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return content_hash(f"{BUILD_VERSION}:{canonical}")
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the build manifest, or an empty one if it does not exist yet."""
+    if not os.path.exists(manifest_path):
+        return {"version": BUILD_VERSION, "files": {}}
+    manifest = load_json(manifest_path)
+    if manifest.get("version") != BUILD_VERSION:
+        return {"version": BUILD_VERSION, "files": {}}
+    return manifest
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Write the build manifest."""
+    write_json(manifest_path, manifest)
+
+
+def _current_entry(filepath, entry):
+    """Return the manifest entry if the output file is still the one it records, else None.
+
+    A file whose mtime changed but whose content still matches gets an entry
+    with the new mtime, so later builds don't hash it again.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    if stat.st_size != entry.get("size"):
+        return None
+    if stat.st_mtime_ns == entry.get("mtime_ns"):
+        return entry
+    with open(filepath, 'rb') as f:
+        if content_hash(f.read()) != entry.get("output"):
+            return None
+    return dict(entry, mtime_ns=stat.st_mtime_ns)
+
+
+def _manifest_entry(filepath, in_hash, out_hash):
+    stat = os.stat(filepath)
+    return {
+        "input": in_hash,
+        "output": out_hash,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+
+def _target_result(filename, source_name, entry):
+    return {
+        "file": filename,
+        "source": source_name,
+        "status": "unchanged",
+        "first_names": None,
+        "last_names": None,
+        "manifest": entry
+    }
+
+
+def plan_target(source_name, region, gender, payload, output_dir=NAMES_DIR, entry=None, force=False):
+    """Check one region/gender file against its manifest entry.
+
+    Returns (result, None) if the file is up to date, otherwise (None, args)
+    where args are the write_target arguments that rebuild it.
+    """
+    filename = name_file_name(region, gender)
+    filepath = os.path.join(output_dir, filename)
+    in_hash = input_hash(payload)
+    if not force and entry and entry.get("input") == in_hash:
+        current = _current_entry(filepath, entry)
+        if current:
+            return _target_result(filename, source_name, current), None
+    return None, (filename, source_name, payload, in_hash, output_dir)
+
+
+def write_target(filename, source_name, payload, in_hash, output_dir=NAMES_DIR):
+    """Dedupe, serialize and write one name file from its source payload; returns a result dict."""
+    filepath = os.path.join(output_dir, filename)
+    result = _target_result(filename, source_name, None)
+
+    json_data = dict(payload)
+    with phase("dedupe"):
+        json_data["firstNames"] = dedupe_names(payload["firstNames"])
+        json_data["lastNames"] = dedupe_names(payload["lastNames"])
+    with phase("serialize"):
+        encoded = serialize_json(json_data).encode('utf-8')
+        out_hash = content_hash(encoded)
+
+    if write_bytes(filepath, encoded):
+        result["status"] = "built"
+
+    result["first_names"] = len(json_data["firstNames"])
+    result["last_names"] = len(json_data["lastNames"])
+    result["manifest"] = _manifest_entry(filepath, in_hash, out_hash)
+    return result
+
+
+def build_target(source_name, region, gender, payload, output_dir=NAMES_DIR, entry=None, force=False):
+    """Build one region/gender file from its source payload if it changed; returns a result dict."""
+    result, write_args = plan_target(source_name, region, gender, payload, output_dir, entry, force)
+    return result or write_target(*write_args)
+
+
+def build_name_assets(output_dir=NAMES_DIR, manifest_path=MANIFEST_PATH, force=False, jobs=1):
+    """Rebuild every name file whose inputs changed since the last build.
+
+    jobs > 1 builds files in that many worker processes; jobs == 0 uses every CPU.
+    """
+    if jobs < 0:
+        raise ValueError("jobs must not be negative")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    entries = manifest["files"]
+
+    with phase("load"):
+        targets = collect_targets()
+    tasks = [
+        (source_name, region, gender, payload, output_dir, entries.get(name_file_name(region, gender)), force)
+        for (region, gender), (source_name, payload) in targets.items()
+    ]
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1:
+        # Manifest checks stay here; workers get the payload and input hash of
+        # each stale file and only dedupe, serialize and write it
+        plans = [plan_target(*task) for task in tasks]
+        results = [result for result, _ in plans]
+        stale = [position for position, result in enumerate(results) if result is None]
+        if stale:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as executor:
+                # map() yields in submission order, which keeps the build deterministic
+                written = executor.map(write_target, *zip(*(plans[position][1] for position in stale)))
+                for position, result in zip(stale, written):
+                    results[position] = result
+    else:
+        results = []
+        for task in tasks:
+            with track_file(name_file_name(task[1], task[2])):
+                results.append(build_target(*task))
+
+    for result in results:
+        entries[result["file"]] = result["manifest"]
+        if result["status"] == "built":
+            print(f"Generated {result['file']} with {result['first_names']} first names and {result['last_names']} last names")
+
+    save_manifest(manifest, manifest_path)
+
+    built = sum(1 for result in results if result["status"] == "built")
+    print(f"[OK] {built} of {len(results)} name files rebuilt, {len(results) - built} up to date")
+    return results
+
+
+def build(args):
+    """Run the build and its optional extra stages for parsed arguments."""
+    build_name_assets(args.output_dir, args.manifest, args.force, args.jobs)
+
+    if args.binary:
+        from name_pool_binary import write_binary_pools
+        write_binary_pools(args.output_dir)
+
+    if args.compress:
+        from compress_assets import compress_assets
+        compress_assets(args.output_dir)
+
+    if args.index:
+        from name_index import build_name_index
+        build_name_index(args.output_dir)
+
+    if args.phonetic:
+        from phonetic_index import build_phonetic_index
+        build_phonetic_index(args.output_dir)
+
+    if args.alias:
+        from alias_tables import write_alias_tables
+        write_alias_tables(args.output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally build the name asset files.")
+    parser.add_argument("--output-dir", default=NAMES_DIR, help="directory to write name files to")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="path of the content-hash manifest")
+    parser.add_argument("--force", action="store_true", help="rebuild every file regardless of the manifest")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes to build with (0 = one per CPU)")
+    parser.add_argument("--binary", action="store_true", help="also write compact .s4np pools for every name file")
+    parser.add_argument("--compress", action="store_true",
+                        help="also write minified and gzip/brotli/zstd variants of every asset")
+    parser.add_argument("--index", action="store_true",
+                        help="also write the global name index of every name file")
+    parser.add_argument("--phonetic", action="store_true",
+                        help="also write the Metaphone/Soundex sound-alike index of every name")
+    parser.add_argument("--alias", action="store_true",
+                        help="also write alias tables for every name list with weight data")
+    # Worker processes are not instrumented; profile with --jobs 1 for per-file phases
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must not be negative")
+
+    run_profiled("build_assets", args, build, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Minified and precompressed variants of the name and trait assets.
+
+Every names/*.json and traits/traits.json file is re-serialized in compact
+canonical form (same key order, no whitespace) and compressed with every
+codec available locally: gzip always, brotli and zstd when their modules are
+installed. Variants are written under assets/data/compressed/ with the same
+relative paths, and a size table compares each one with the indented
+original.
+"""
+
+import argparse
+import gzip
+import os
+
+from asset_io import ASSETS_DIR, NAMES_DIR, TRAITS_DIR, iter_name_files, load_json, serialize_json, write_bytes
+from pipeline_profile import add_profile_arguments, phase, run_profiled
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSED_DIR = os.path.join(ASSETS_DIR, "compressed")
+MINIFIED_SUFFIX = ".min.json"
+
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical between runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+
+def _zstd(data):
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+
+def available_codecs():
+    """Return (name, extension, compress function) for every codec installed locally."""
+    codecs = [("gzip", ".gz", _gzip)]
+    if brotli is not None:
+        codecs.append(("brotli", ".br", _brotli))
+    if zstandard is not None:
+        codecs.append(("zstd", ".zst", _zstd))
+    return codecs
+
+
+def asset_files(names_dir=NAMES_DIR, traits_dir=TRAITS_DIR):
+    """Return (path, path relative to the assets dir) for every name and trait file."""
+    files = [(str(path), os.path.join("names", path.name)) for path in iter_name_files(names_dir)]
+    traits_path = os.path.join(traits_dir, "traits.json")
+    if os.path.exists(traits_path):
+        files.append((traits_path, os.path.join("traits", "traits.json")))
+    return files
+
+
+def compress_asset(source_path, relative_path, output_dir=COMPRESSED_DIR, codecs=None):
+    """Write the minified and compressed variants of one asset; returns {variant: bytes}."""
+    codecs = available_codecs() if codecs is None else codecs
+    sizes = {"original": os.path.getsize(source_path)}
+
+    with phase("serialize"):
+        minified = serialize_json(load_json(source_path), compact=True).encode('utf-8')
+    stem = os.path.splitext(relative_path)[0]
+    output_stem = os.path.join(output_dir, stem)
+    os.makedirs(os.path.dirname(output_stem), exist_ok=True)
+
+    write_bytes(output_stem + MINIFIED_SUFFIX, minified)
+    sizes["minified"] = len(minified)
+    for name, extension, compress in codecs:
+        with phase("compress"):
+            blob = compress(minified)
+        write_bytes(output_stem + MINIFIED_SUFFIX + extension, blob)
+        sizes[name] = len(blob)
+    return sizes
+
+
+def compress_assets(names_dir=NAMES_DIR, traits_dir=TRAITS_DIR, output_dir=COMPRESSED_DIR):
+    """Write variants for every asset and print the size table; returns {relative path: sizes}."""
+    codecs = available_codecs()
+    missing = [name for name, module in (("brotli", brotli), ("zstd", zstandard)) if module is None]
+    if missing:
+        print(f"[INFO] Codecs not installed, skipped: {', '.join(missing)}")
+
+    results = {}
+    for source_path, relative_path in asset_files(names_dir, traits_dir):
+        results[relative_path] = compress_asset(source_path, relative_path, output_dir, codecs)
+
+    report(results, [name for name, _, _ in codecs])
+    print(f"\n[OK] Wrote variants of {len(results)} files to {output_dir}")
+    return results
+
+
+def report(results, codec_names):
+    """Print each file's variant sizes and their ratio to the indented original."""
+    columns = ["minified"] + codec_names
+    print(f"{'file':<36}{'original':>10}" + "".join(f"{column:>16}" for column in columns))
+    totals = dict.fromkeys(["original"] + columns, 0)
+    for relative_path, sizes in results.items():
+        for key in totals:
+            totals[key] += sizes[key]
+        _report_row(relative_path, sizes, columns)
+    _report_row("total", totals, columns)
+
+
+def _report_row(label, sizes, columns):
+    original = sizes["original"]
+    cells = "".join(f"{sizes[column]:>9} {sizes[column] / original:>5.0%}" if original else f"{sizes[column]:>16}"
+                    for column in columns)
+    print(f"{label:<36}{original:>10}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write minified and precompressed asset variants.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--traits-dir", default=TRAITS_DIR, help="directory containing traits.json")
+    parser.add_argument("--output-dir", default=COMPRESSED_DIR, help="directory to write the variants to")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    run_profiled("compress_assets", args, compress_assets, args.names_dir, args.traits_dir, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
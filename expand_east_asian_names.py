@@ -3,8 +3,10 @@
 Script to expand East Asian name files with authentic Chinese, Japanese, and Korean names.
 """
 
-import json
-import random
+import os
+
+from asset_io import NAMES_DIR, write_json
+from pipeline_profile import run_script
 
 # Authentic East Asian names based on 2024 research
 CHINESE_FEMALE_NAMES = [
@@ -87,8 +89,8 @@ MALE_NAMES = CHINESE_MALE_NAMES + JAPANESE_MALE_NAMES + KOREAN_MALE_NAMES
 # Extract surnames from full names
 SURNAMES = list(set([name.split()[0] for name in FEMALE_NAMES + MALE_NAMES]))
 
-def expand_east_asian_files():
-    """Expand the East Asian name files with authentic names."""
+def east_asian_name_data():
+    """Build the East Asian female and male name payloads."""
     
     # Female names
     female_data = {
@@ -105,16 +107,20 @@ def expand_east_asian_files():
         "firstNames": sorted(list(set([name.split()[1] for name in MALE_NAMES]))),
         "lastNames": sorted(SURNAMES)
     }
-    
+
+    return female_data, male_data
+
+def expand_east_asian_files():
+    """Expand the East Asian name files with authentic names."""
+    female_data, male_data = east_asian_name_data()
+
     # Write files
-    with open('sims4_name_generator/assets/data/names/eastAsian_female.json', 'w', encoding='utf-8') as f:
-        json.dump(female_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'eastAsian_female.json'), female_data)
     
-    with open('sims4_name_generator/assets/data/names/eastAsian_male.json', 'w', encoding='utf-8') as f:
-        json.dump(male_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'eastAsian_male.json'), male_data)
     
     print(f"Updated eastAsian_female.json: {len(female_data['firstNames'])} first names, {len(female_data['lastNames'])} last names")
     print(f"Updated eastAsian_male.json: {len(male_data['firstNames'])} first names, {len(male_data['lastNames'])} last names")
 
 if __name__ == "__main__":
-    expand_east_asian_files()
\ No newline at end of file
+    run_script("expand_east_asian_names", expand_east_asian_files, "Expand the East Asian name files.")
\ No newline at end of file
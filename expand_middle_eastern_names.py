@@ -3,7 +3,10 @@
 Script to expand Middle Eastern name files with authentic Arabic and Persian names.
 """
 
-import json
+import os
+
+from asset_io import NAMES_DIR, write_json
+from pipeline_profile import run_script
 
 # Authentic Middle Eastern female names based on 2024 research
 MIDDLE_EASTERN_FEMALE_NAMES = [
@@ -65,8 +68,8 @@ MIDDLE_EASTERN_SURNAMES = [
     "Bin Laden", "Bin Zayed", "Bin Mohammed", "Bin Rashid", "Bin Khalifa", "Bin Hamad", "Bin Thani"
 ]
 
-def expand_middle_eastern_files():
-    """Expand the Middle Eastern name files with authentic names."""
+def middle_eastern_name_data():
+    """Build the Middle Eastern female and male name payloads."""
     
     # Female names
     female_data = {
@@ -83,16 +86,20 @@ def expand_middle_eastern_files():
         "firstNames": sorted(MIDDLE_EASTERN_MALE_NAMES),
         "lastNames": sorted(MIDDLE_EASTERN_SURNAMES)
     }
-    
+
+    return female_data, male_data
+
+def expand_middle_eastern_files():
+    """Expand the Middle Eastern name files with authentic names."""
+    female_data, male_data = middle_eastern_name_data()
+
     # Write files
-    with open('sims4_name_generator/assets/data/names/middleEastern_female.json', 'w', encoding='utf-8') as f:
-        json.dump(female_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'middleEastern_female.json'), female_data)
     
-    with open('sims4_name_generator/assets/data/names/middleEastern_male.json', 'w', encoding='utf-8') as f:
-        json.dump(male_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'middleEastern_male.json'), male_data)
     
     print(f"Updated middleEastern_female.json: {len(female_data['firstNames'])} first names, {len(female_data['lastNames'])} last names")
     print(f"Updated middleEastern_male.json: {len(male_data['firstNames'])} first names, {len(male_data['lastNames'])} last names")
 
 if __name__ == "__main__":
-    expand_middle_eastern_files()
\ No newline at end of file
+    run_script("expand_middle_eastern_names", expand_middle_eastern_files, "Expand the Middle Eastern name files.")
\ No newline at end of file
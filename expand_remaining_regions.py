@@ -3,7 +3,10 @@
 Script to expand remaining small region name files with authentic names.
 """
 
-import json
+import os
+
+from asset_io import NAMES_DIR, write_json
+from pipeline_profile import run_script
 
 # Northern European Names (Swedish, Norwegian, Danish, Finnish)
 NORTHERN_EUROPEAN_FEMALE_NAMES = [
@@ -111,8 +114,8 @@ OCEANIA_SURNAMES = [
     "Tupou", "Vea", "Vuna", "Fainga'a", "Holani", "Kaufusi", "Langi", "Lousi", "Mahina", "Pouha"
 ]
 
-def expand_northern_european_files():
-    """Expand Northern European name files."""
+def northern_european_name_data():
+    """Build the Northern European female and male name payloads."""
     # Female names
     female_data = {
         "region": "northernEuropean",
@@ -128,19 +131,23 @@ def expand_northern_european_files():
         "firstNames": sorted(NORTHERN_EUROPEAN_MALE_NAMES),
         "lastNames": sorted(NORTHERN_EUROPEAN_SURNAMES)
     }
-    
+
+    return female_data, male_data
+
+def expand_northern_european_files():
+    """Expand Northern European name files."""
+    female_data, male_data = northern_european_name_data()
+
     # Write files
-    with open('sims4_name_generator/assets/data/names/northernEuropean_female.json', 'w', encoding='utf-8') as f:
-        json.dump(female_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'northernEuropean_female.json'), female_data)
     
-    with open('sims4_name_generator/assets/data/names/northernEuropean_male.json', 'w', encoding='utf-8') as f:
-        json.dump(male_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'northernEuropean_male.json'), male_data)
     
     print(f"Updated northernEuropean_female.json: {len(female_data['firstNames'])} first names, {len(female_data['lastNames'])} last names")
     print(f"Updated northernEuropean_male.json: {len(male_data['firstNames'])} first names, {len(male_data['lastNames'])} last names")
 
-def expand_oceania_files():
-    """Expand Oceania name files."""
+def oceania_name_data():
+    """Build the Oceania female and male name payloads."""
     # Female names
     female_data = {
         "region": "oceania",
@@ -156,13 +163,17 @@ def expand_oceania_files():
         "firstNames": sorted(OCEANIA_MALE_NAMES),
         "lastNames": sorted(OCEANIA_SURNAMES)
     }
-    
+
+    return female_data, male_data
+
+def expand_oceania_files():
+    """Expand Oceania name files."""
+    female_data, male_data = oceania_name_data()
+
     # Write files
-    with open('sims4_name_generator/assets/data/names/oceania_female.json', 'w', encoding='utf-8') as f:
-        json.dump(female_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'oceania_female.json'), female_data)
     
-    with open('sims4_name_generator/assets/data/names/oceania_male.json', 'w', encoding='utf-8') as f:
-        json.dump(male_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'oceania_male.json'), male_data)
     
     print(f"Updated oceania_female.json: {len(female_data['firstNames'])} first names, {len(female_data['lastNames'])} last names")
     print(f"Updated oceania_male.json: {len(male_data['firstNames'])} first names, {len(male_data['lastNames'])} last names")
@@ -172,4 +183,4 @@ def main():
     expand_oceania_files()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_script("expand_remaining_regions", main, "Expand the Northern European and Oceania name files.")
\ No newline at end of file
@@ -3,7 +3,10 @@
 Script to expand South Asian name files with authentic Indian and Pakistani names.
 """
 
-import json
+import os
+
+from asset_io import NAMES_DIR, write_json
+from pipeline_profile import run_script
 
 # Authentic South Asian female names (Indian, Pakistani, Bangladeshi, Sri Lankan)
 SOUTH_ASIAN_FEMALE_NAMES = [
@@ -80,8 +83,8 @@ SOUTH_ASIAN_SURNAMES = [
     "Acharya", "Bhandari", "Chowdhury", "Fernandes", "Gomes", "D'Souza", "Pereira", "Rodrigues", "Silva", "Costa"
 ]
 
-def expand_south_asian_files():
-    """Expand the South Asian name files with authentic names."""
+def south_asian_name_data():
+    """Build the South Asian female and male name payloads."""
     
     # Female names
     female_data = {
@@ -98,16 +101,20 @@ def expand_south_asian_files():
         "firstNames": sorted(SOUTH_ASIAN_MALE_NAMES),
         "lastNames": sorted(SOUTH_ASIAN_SURNAMES)
     }
-    
+
+    return female_data, male_data
+
+def expand_south_asian_files():
+    """Expand the South Asian name files with authentic names."""
+    female_data, male_data = south_asian_name_data()
+
     # Write files
-    with open('sims4_name_generator/assets/data/names/southAsian_female.json', 'w', encoding='utf-8') as f:
-        json.dump(female_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'southAsian_female.json'), female_data)
     
-    with open('sims4_name_generator/assets/data/names/southAsian_male.json', 'w', encoding='utf-8') as f:
-        json.dump(male_data, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(NAMES_DIR, 'southAsian_male.json'), male_data)
     
     print(f"Updated southAsian_female.json: {len(female_data['firstNames'])} first names, {len(female_data['lastNames'])} last names")
     print(f"Updated southAsian_male.json: {len(male_data['firstNames'])} first names, {len(male_data['lastNames'])} last names")
 
 if __name__ == "__main__":
-    expand_south_asian_files()
\ No newline at end of file
+    run_script("expand_south_asian_names", expand_south_asian_files, "Expand the South Asian name files.")
\ No newline at end of file
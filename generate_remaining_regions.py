@@ -4,9 +4,11 @@ Script to generate comprehensive name datasets for the remaining regions in the
 This script creates JSON files with 250 first names and 250 last names for each remaining region.
 """
 
-import json
 import os
 
+from asset_io import write_json
+from pipeline_profile import run_script
+
 # Comprehensive name datasets for remaining regions
 REMAINING_REGIONS_DATA = {
     "northernEuropean": {
@@ -381,10 +383,9 @@ def generate_remaining_region_files():
                 "lastNames": names["lastNames"]
             }
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+            write_json(filepath, json_data)
 
             print(f"Generated {filename} with {len(names['firstNames'])} first names and {len(names['lastNames'])} last names")
 
 if __name__ == "__main__":
-    generate_remaining_region_files() 
\ No newline at end of file
+    run_script("generate_remaining_regions", generate_remaining_region_files, "Generate the remaining region name files.") 
\ No newline at end of file
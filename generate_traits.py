@@ -4,9 +4,16 @@ Script to generate comprehensive traits database for the Sims 4 Name Generator.
 This script creates a JSON file with all official Sims 4 traits from base game and expansion packs.
 """
 
-import json
+import argparse
 import os
 
+from asset_io import write_json
+from pipeline_profile import add_profile_arguments, run_profiled
+from trait_combinations import report as report_trait_combinations
+from trait_combinations import write_combination_table
+from trait_index import write_trait_index
+from trait_postings import write_trait_postings
+
 # Comprehensive traits database
 TRAITS_DATA = {
     "traits": [
@@ -736,15 +743,28 @@ TRAITS_DATA = {
     ]
 }
 
-def generate_traits_file():
-    """Generate comprehensive traits JSON file."""
+def generate_trait_sidecars(traits):
+    """Write the trait index, postings and combination table sidecars for a traits list."""
+    index = write_trait_index(traits)
+    print(f"\nGenerated traits_index.json with {len(index['ids'])} trait bitsets")
+    if index['unknownConflicts']:
+        print(f"[ERROR] Unknown conflicting trait IDs: {', '.join(index['unknownConflicts'])}")
+    
+    postings = write_trait_postings(traits)
+    print(f"Generated traits_postings.json with {len(postings['categories'])} category and {len(postings['packs'])} pack posting lists")
+    
+    combinations = write_combination_table(traits)
+    print(f"\nGenerated trait_combinations.json:")
+    report_trait_combinations(combinations)
+
+def generate_traits_file(sidecars=True):
+    """Generate comprehensive traits JSON file, and its sidecars unless sidecars is False."""
     output_dir = "sims4_name_generator/assets/data/traits"
     os.makedirs(output_dir, exist_ok=True)
     
     filepath = os.path.join(output_dir, "traits.json")
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(TRAITS_DATA, f, indent=2, ensure_ascii=False)
+    write_json(filepath, TRAITS_DATA)
     
     print(f"Generated traits.json with {len(TRAITS_DATA['traits'])} traits")
     print(f"Traits by category:")
@@ -760,6 +780,18 @@ def generate_traits_file():
     print(f"\nTraits by pack:")
     for pack, count in packs.items():
         print(f"  {pack}: {count}")
+    
+    if sidecars:
+        generate_trait_sidecars(TRAITS_DATA['traits'])
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the traits database and its sidecars.")
+    parser.add_argument("--no-sidecars", action="store_true",
+                        help="only write traits.json, not the index, postings and combination sidecars")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    run_profiled("generate_traits", args, generate_traits_file, not args.no_sidecars)
 
 if __name__ == "__main__":
-    generate_traits_file() 
\ No newline at end of file
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Global inverted index over every region/gender name file.
+
+One pass over the name files maps each name to its postings: the file, list
+(firstNames/lastNames) and position where it appears. Names are interned in a
+sorted string table and postings are packed into unsigned 32-bit integers
+stored in one flat array with per-name offsets, so "which regions use Hamza?"
+is a single dictionary lookup instead of a scan over every file.
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from collections import defaultdict
+
+from asset_io import (
+    INDEX_DIR,
+    NAME_LISTS,
+    NAMES_DIR,
+    content_hash,
+    iter_name_files,
+    load_json,
+    split_name_file_stem,
+    write_json,
+)
+
+INDEX_PATH = os.path.join(INDEX_DIR, "name_index.json")
+INDEX_VERSION = 1
+
+# Packed posting layout: 10 bits file id | 1 bit list id | 21 bits position
+_FILE_SHIFT = 22
+_LIST_SHIFT = 21
+_POSITION_MASK = (1 << _LIST_SHIFT) - 1
+MAX_FILES = 1 << 10
+MAX_POSITION = _POSITION_MASK
+
+
+def pack_posting(file_id, list_id, position):
+    """Pack a (file, list, position) posting into one unsigned 32-bit integer."""
+    return (file_id << _FILE_SHIFT) | (list_id << _LIST_SHIFT) | position
+
+
+def unpack_posting(posting):
+    """Unpack a posting into its (file id, list id, position)."""
+    return posting >> _FILE_SHIFT, (posting >> _LIST_SHIFT) & 1, posting & _POSITION_MASK
+
+
+class NameIndex:
+    """Inverted index from name to (region, gender, list, position) postings."""
+
+    def __init__(self, files, names, offsets, postings, list_hashes):
+        self.files = files
+        self.names = [sys.intern(name) for name in names]
+        self.offsets = offsets
+        self.postings = postings
+        self.list_hashes = list_hashes
+        self._name_ids = {name: name_id for name_id, name in enumerate(self.names)}
+
+    @classmethod
+    def build(cls, names_dir=NAMES_DIR):
+        """Build the index with a single pass over every name file."""
+        files = []
+        list_hashes = []
+        name_postings = defaultdict(lambda: array('I'))
+
+        for file_id, file_path in enumerate(iter_name_files(names_dir)):
+            if file_id >= MAX_FILES:
+                raise ValueError(f"Too many name files for the index (max {MAX_FILES})")
+            region, gender = split_name_file_stem(file_path.stem)
+            files.append({"region": region, "gender": gender, "file": file_path.name})
+
+            data = load_json(file_path)
+            hashes = []
+            for list_id, list_name in enumerate(NAME_LISTS):
+                names = data.get(list_name, [])
+                if len(names) > MAX_POSITION:
+                    raise ValueError(f"{file_path.name} {list_name} is too long for the index")
+                for position, name in enumerate(names):
+                    name_postings[name].append(pack_posting(file_id, list_id, position))
+                hashes.append(content_hash("\n".join(names)))
+            list_hashes.append(hashes)
+
+        names = sorted(name_postings)
+        offsets = array('I', [0])
+        postings = array('I')
+        for name in names:
+            postings.extend(name_postings[name])
+            offsets.append(len(postings))
+
+        return cls(files, names, offsets, postings, list_hashes)
+
+    @classmethod
+    def load(cls, index_path=INDEX_PATH):
+        """Load a persisted index."""
+        data = load_json(index_path)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported name index version in {index_path}")
+        return cls(
+            data["files"],
+            data["names"],
+            array('I', data["offsets"]),
+            array('I', data["postings"]),
+            data["listHashes"]
+        )
+
+    def save(self, index_path=INDEX_PATH):
+        """Persist the index as compact JSON."""
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "lists": list(NAME_LISTS),
+            "files": self.files,
+            "names": self.names,
+            "offsets": self.offsets.tolist(),
+            "postings": self.postings.tolist(),
+            "listHashes": self.list_hashes
+        }
+        write_json(index_path, data, compact=True)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._name_ids
+
+    def _raw_postings(self, name):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            return ()
+        return self.postings[self.offsets[name_id]:self.offsets[name_id + 1]]
+
+    def postings_for(self, name):
+        """Return every (region, gender, list, position) occurrence of a name."""
+        result = []
+        for posting in self._raw_postings(name):
+            file_id, list_id, position = unpack_posting(posting)
+            file_info = self.files[file_id]
+            result.append((file_info["region"], file_info["gender"], NAME_LISTS[list_id], position))
+        return result
+
+    def regions_for(self, name):
+        """Return the sorted regions a name appears in."""
+        return sorted({self.files[posting >> _FILE_SHIFT]["region"] for posting in self._raw_postings(name)})
+
+    def cross_region_names(self, min_regions=2):
+        """Yield (name, regions) for names used by at least min_regions regions."""
+        for name_id, name in enumerate(self.names):
+            file_ids = {posting >> _FILE_SHIFT
+                        for posting in self.postings[self.offsets[name_id]:self.offsets[name_id + 1]]}
+            regions = {self.files[file_id]["region"] for file_id in file_ids}
+            if len(regions) >= min_regions:
+                yield name, sorted(regions)
+
+    def identical_lists(self):
+        """Return groups of (file, list) pairs whose contents are identical."""
+        groups = defaultdict(list)
+        for file_info, hashes in zip(self.files, self.list_hashes):
+            for list_name, list_hash in zip(NAME_LISTS, hashes):
+                groups[list_hash].append((file_info["file"], list_name))
+        return [group for group in groups.values() if len(group) > 1]
+
+
+def build_name_index(names_dir=NAMES_DIR, index_path=INDEX_PATH):
+    """Build and persist the global name index."""
+    index = NameIndex.build(names_dir)
+    index.save(index_path)
+    print(f"[OK] Indexed {len(index)} unique names ({len(index.postings)} postings) "
+          f"from {len(index.files)} files into {index_path}")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the global name index.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--index", default=INDEX_PATH, help="path of the persisted index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="build and save the index")
+    query_parser = subparsers.add_parser("query", help="show where names appear")
+    query_parser.add_argument("names", nargs="+")
+    overlap_parser = subparsers.add_parser("overlaps", help="report cross-region names and identical lists")
+    overlap_parser.add_argument("--min-regions", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_name_index(args.names_dir, args.index)
+        return
+
+    index = NameIndex.load(args.index)
+    if args.command == "query":
+        for name in args.names:
+            postings = index.postings_for(name)
+            if not postings:
+                print(f"{name}: not found")
+                continue
+            print(f"{name}: {', '.join(index.regions_for(name))}")
+            for region, gender, list_name, position in postings:
+                print(f"  {region}_{gender} {list_name}[{position}]")
+    elif args.command == "overlaps":
+        shared = list(index.cross_region_names(args.min_regions))
+        print(f"Names used by {args.min_regions}+ regions: {len(shared)}")
+        for name, regions in shared:
+            print(f"  {name}: {', '.join(regions)}")
+        print("\nIdentical lists:")
+        for group in index.identical_lists():
+            print("  " + " == ".join(f"{file_name}:{list_name}" for file_name, list_name in group))
+
+
+if __name__ == "__main__":
+    main()
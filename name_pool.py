@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Lazy first x last name cross product over a generated region/gender file.
+
+A NamePool never materializes the combinations: combination k is the pair
+(firstNames[k // len(lastNames)], lastNames[k % len(lastNames)]), so the pool
+only holds the two name lists and a range of combination indices. Slicing
+returns another pool over a sub-range in O(1), and sampling draws indices from
+that range without building the product.
+"""
+
+import os
+import random
+
+from asset_io import NAMES_DIR, iter_name_files, load_json, name_file_name, split_name_file_stem
+
+
+class NamePool:
+    """Sequence of (first name, last name) pairs indexed as i * len(last) + j."""
+
+    def __init__(self, first_names, last_names, region=None, gender=None, indices=None):
+        self.first_names = first_names
+        self.last_names = last_names
+        self.region = region
+        self.gender = gender
+        self._last_count = len(last_names)
+        self._indices = range(len(first_names) * len(last_names)) if indices is None else indices
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load a pool from a generated name JSON file."""
+        data = load_json(file_path)
+        region, gender = split_name_file_stem(os.path.splitext(os.path.basename(file_path))[0])
+        return cls(data["firstNames"], data["lastNames"], region, gender)
+
+    @classmethod
+    def load(cls, region, gender, names_dir=NAMES_DIR):
+        """Load the pool for a region/gender from the names directory."""
+        return cls.from_file(os.path.join(names_dir, name_file_name(region, gender)))
+
+    def decode(self, combination):
+        """Decode a combination index over the full product into a name pair."""
+        first_index, last_index = divmod(combination, self._last_count)
+        return self.first_names[first_index], self.last_names[last_index]
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return NamePool(self.first_names, self.last_names, self.region, self.gender, self._indices[key])
+        return self.decode(self._indices[key])
+
+    def __iter__(self):
+        return map(self.decode, self._indices)
+
+    def index_of(self, first_name, last_name):
+        """Return the position of a name pair in this pool."""
+        combination = self.first_names.index(first_name) * self._last_count + self.last_names.index(last_name)
+        return self._indices.index(combination)
+
+    def choice(self, rng=random):
+        """Draw one pair uniformly at random."""
+        return self.decode(rng.choice(self._indices))
+
+    def sample(self, k, rng=random):
+        """Draw k distinct pairs uniformly at random, without building the product."""
+        return [self.decode(combination) for combination in rng.sample(self._indices, k)]
+
+    def choices(self, k, rng=random):
+        """Draw k pairs uniformly at random with replacement."""
+        return [self.decode(combination) for combination in rng.choices(self._indices, k=k)]
+
+    def __repr__(self):
+        return f"NamePool(region={self.region!r}, gender={self.gender!r}, size={len(self)})"
+
+
+def load_all_pools(names_dir=NAMES_DIR):
+    """Load a pool for every region/gender file, keyed by (region, gender)."""
+    pools = {}
+    for file_path in iter_name_files(names_dir):
+        pool = NamePool.from_file(file_path)
+        pools[(pool.region, pool.gender)] = pool
+    return pools
+
+
+if __name__ == "__main__":
+    pools = load_all_pools()
+    total = sum(len(pool) for pool in pools.values())
+    for (region, gender), pool in sorted(pools.items()):
+        print(f"{region}_{gender}: {len(pool)} combinations")
+    print(f"\n[OK] {len(pools)} pools, {total} combinations total")
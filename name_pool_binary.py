@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Compact binary name-pool format with a zero-copy mmap reader.
+
+Each region/gender name file becomes one .s4np blob laid out as:
+
+    header      <4sHHIIIII  magic, version, reserved, first count, last count,
+                            meta length, string table length, CRC-32 of the body
+    meta        "region\\0gender" in UTF-8, padded to 4 bytes
+    offsets     (first count + 1) uint32 offsets into the string table
+    offsets     (last count + 1) uint32 offsets into the string table
+    strings     every first name then every last name, UTF-8, no separators
+
+All integers are little-endian. The reader maps the file and decodes a single
+name per lookup, so opening a pool costs no parsing at all.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import tracemalloc
+import zlib
+
+from asset_io import ASSETS_DIR, NAMES_DIR, iter_name_files, load_json, write_bytes
+
+BINARY_DIR = os.path.join(ASSETS_DIR, "bin")
+BINARY_SUFFIX = ".s4np"
+
+MAGIC = b"S4NP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIII")
+_OFFSET_PAIR = struct.Struct("<II")
+
+
+def _pad4(length):
+    return (4 - length % 4) % 4
+
+
+def encode_pool(region, gender, first_names, last_names):
+    """Encode a name pool into the binary format and return the bytes."""
+    meta = f"{region}\0{gender}".encode("utf-8")
+    meta += b"\0" * _pad4(len(meta))
+
+    encoded = [name.encode("utf-8") for name in first_names + last_names]
+    strings = b"".join(encoded)
+
+    first_offsets = [0]
+    for value in encoded[:len(first_names)]:
+        first_offsets.append(first_offsets[-1] + len(value))
+    last_offsets = [first_offsets[-1]]
+    for value in encoded[len(first_names):]:
+        last_offsets.append(last_offsets[-1] + len(value))
+
+    body = b"".join([
+        meta,
+        struct.pack(f"<{len(first_offsets)}I", *first_offsets),
+        struct.pack(f"<{len(last_offsets)}I", *last_offsets),
+        strings,
+    ])
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(first_names), len(last_names),
+                         len(meta), len(strings), zlib.crc32(body))
+    return header + body
+
+
+def write_binary_pool(json_path, output_dir=BINARY_DIR):
+    """Convert one name JSON file to its .s4np form; returns (path, written)."""
+    data = load_json(json_path)
+    blob = encode_pool(data["region"], data["gender"], data["firstNames"], data["lastNames"])
+    output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(json_path))[0] + BINARY_SUFFIX)
+
+    return output_path, write_bytes(output_path, blob)
+
+
+def write_binary_pools(names_dir=NAMES_DIR, output_dir=BINARY_DIR):
+    """Write a .s4np file for every region/gender name file."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    total = 0
+    for json_path in iter_name_files(names_dir):
+        output_path, changed = write_binary_pool(json_path, output_dir)
+        total += 1
+        if changed:
+            written += 1
+            print(f"Generated {os.path.basename(output_path)} ({os.path.getsize(output_path)} bytes)")
+    print(f"[OK] {written} of {total} binary pools written, {total - written} up to date")
+
+
+class BinaryNamePool:
+    """Read-only view of a .s4np file backed by mmap."""
+
+    def __init__(self, path, verify=False):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self.first_count, self.last_count,
+         meta_length, strings_length, checksum) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary name pool")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary name pool version {version} in {path}")
+
+        self._checksum = checksum
+        meta_start = HEADER.size
+        region, gender = bytes(self._map[meta_start:meta_start + meta_length]).rstrip(b"\0").split(b"\0")
+        self.region = region.decode("utf-8")
+        self.gender = gender.decode("utf-8")
+
+        self._first_offsets = meta_start + meta_length
+        self._last_offsets = self._first_offsets + 4 * (self.first_count + 1)
+        self._strings = self._last_offsets + 4 * (self.last_count + 1)
+        if self._strings + strings_length != len(self._map):
+            self.close()
+            raise ValueError(f"Truncated binary name pool {path}")
+
+        if verify and not self.verify():
+            self.close()
+            raise ValueError(f"Checksum mismatch in {path}")
+
+    def verify(self):
+        """Check the stored CRC-32 against the mapped body."""
+        with memoryview(self._map) as view:
+            return zlib.crc32(view[HEADER.size:]) == self._checksum
+
+    def _name(self, offsets_start, count, index):
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("name index out of range")
+        start, end = _OFFSET_PAIR.unpack_from(self._map, offsets_start + 4 * index)
+        return self._map[self._strings + start:self._strings + end].decode("utf-8")
+
+    def first_name(self, index):
+        """Return the first name at index."""
+        return self._name(self._first_offsets, self.first_count, index)
+
+    def last_name(self, index):
+        """Return the last name at index."""
+        return self._name(self._last_offsets, self.last_count, index)
+
+    def first_names(self):
+        """Decode every first name."""
+        return [self.first_name(i) for i in range(self.first_count)]
+
+    def last_names(self):
+        """Decode every last name."""
+        return [self.last_name(i) for i in range(self.last_count)]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def compare_load(names_dir=NAMES_DIR, binary_dir=BINARY_DIR, repeat=20):
+    """Print JSON vs binary open latency and allocation for every pool."""
+    print(f"{'file':<32}{'json ms':>10}{'bin ms':>10}{'json KiB':>10}{'bin KiB':>10}")
+    for json_path in iter_name_files(names_dir):
+        binary_path = os.path.join(binary_dir, json_path.stem + BINARY_SUFFIX)
+        if not os.path.exists(binary_path):
+            continue
+
+        def load_json_pool():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data["firstNames"][0], data["lastNames"][0]
+
+        def load_binary_pool():
+            with BinaryNamePool(binary_path) as pool:
+                return pool.first_name(0), pool.last_name(0)
+
+        results = []
+        for loader in (load_json_pool, load_binary_pool):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                loader()
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            tracemalloc.start()
+            loader()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append((elapsed, peak / 1024))
+
+        (json_ms, json_kib), (bin_ms, bin_kib) = results
+        print(f"{json_path.name:<32}{json_ms:>10.3f}{bin_ms:>10.3f}{json_kib:>10.1f}{bin_kib:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect binary name pools.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--output-dir", default=BINARY_DIR, help="directory for .s4np files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="write a .s4np file for every name file")
+    show_parser = subparsers.add_parser("show", help="print a pool's header and a few names")
+    show_parser.add_argument("path")
+    subparsers.add_parser("compare", help="compare JSON and binary load latency and memory")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        write_binary_pools(args.names_dir, args.output_dir)
+    elif args.command == "show":
+        with BinaryNamePool(args.path, verify=True) as pool:
+            print(f"Region: {pool.region}")
+            print(f"Gender: {pool.gender}")
+            print(f"First names: {pool.first_count}, last names: {pool.last_count}")
+            for i in range(min(5, pool.first_count, pool.last_count)):
+                print(f"  {pool.first_name(i)} {pool.last_name(i)}")
+    elif args.command == "compare":
+        compare_load(args.names_dir, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Local asyncio HTTP service for batch name generation.
+
+Every region/gender pool and the trait combination table are loaded once at
+startup and stay in memory; names are JSON-escaped once per pool, so a
+request is answered by drawing indices and joining pre-encoded fragments,
+with no file I/O. HTTP/1.1 with keep-alive is handled directly on asyncio
+streams, so the service needs nothing outside the standard library.
+
+    GET  /generate?region=&gender=&count=&seed=&stage=  JSON document of names
+    POST /bulk                                          NDJSON stream, one name per line
+    GET  /pools                                         regions and genders served
+    GET  /stats                                         request counts and p50/p99 latency
+
+The bulk body is one request object or a list of them, each with the same
+fields as the /generate query. stage (a life stage) adds a valid trait set
+to every name.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from asset_io import NAMES_DIR
+from name_pool import load_all_pools
+from trait_combinations import COMBINATIONS_PATH, LIFE_STAGES, TraitCombinationTable
+from trait_index import TRAITS_PATH
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+MAX_COUNT = 10_000
+MAX_BULK_COUNT = 1_000_000
+MAX_BODY = 1 << 20
+MAX_HEADER = 1 << 14
+# Names per chunk of a streamed response; fixed so seeded output doesn't depend on it
+STREAM_BLOCK = 1000
+# Latency samples kept per route for the percentiles
+LATENCY_WINDOW = 10_000
+
+
+class HTTPError(Exception):
+    """An error answered with its status code and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EncodedPool:
+    """A name pool with every name JSON-escaped once, for building responses by joining strings."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.region = pool.region
+        self.gender = pool.gender
+        self.first_json = [json.dumps(name, ensure_ascii=False) for name in pool.first_names]
+        self.last_json = [json.dumps(name, ensure_ascii=False) for name in pool.last_names]
+        self.line_prefix = f'{{"region":{json.dumps(pool.region)},"gender":{json.dumps(pool.gender)},"firstName":'
+
+    def draw(self, count, rng, table=None, stage=None):
+        """Return count (first JSON, last JSON, traits JSON or None) fragments."""
+        firsts = rng.choices(self.first_json, k=count)
+        lasts = rng.choices(self.last_json, k=count)
+        if stage is None:
+            return zip(firsts, lasts, [None] * count)
+        traits = [json.dumps(table.draw(stage, rng), separators=(",", ":")) for _ in range(count)]
+        return zip(firsts, lasts, traits)
+
+
+class LatencyStats:
+    """Request counts and a sliding window of latencies per route."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.started = time.monotonic()
+
+    def record(self, route, seconds):
+        samples = self.samples.get(route)
+        if samples is None:
+            samples = self.samples[route] = deque(maxlen=self.window)
+        samples.append(seconds)
+        self.counts[route] = self.counts.get(route, 0) + 1
+
+    def summary(self):
+        """Return {route: {requests, p50_ms, p99_ms, max_ms}} over the current windows."""
+        routes = {}
+        for route, samples in self.samples.items():
+            ordered = sorted(samples)
+            routes[route] = {
+                "requests": self.counts[route],
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3)
+            }
+        return {"uptime_s": round(time.monotonic() - self.started, 1), "routes": routes}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class NameService:
+    """In-memory name pools and trait table served over HTTP."""
+
+    def __init__(self, pools, table=None):
+        self.pools = {key: EncodedPool(pool) for key, pool in pools.items()}
+        self.table = table
+        self.stats = LatencyStats()
+
+    @classmethod
+    def load(cls, names_dir=NAMES_DIR, combinations_path=COMBINATIONS_PATH, traits_path=TRAITS_PATH):
+        """Load every pool and the trait table, built from traits.json when its sidecar is missing or stale."""
+        try:
+            table = TraitCombinationTable.from_assets(combinations_path, traits_path)
+        except FileNotFoundError:
+            table = None
+        return cls(load_all_pools(names_dir), table)
+
+    def _parse_spec(self, spec, max_count):
+        """Validate one request's fields; returns (pool, count, rng, stage)."""
+        region = spec.get("region")
+        gender = spec.get("gender")
+        pool = self.pools.get((region, gender))
+        if pool is None:
+            raise HTTPError(404, f"No name pool for region={region!r} gender={gender!r}")
+        try:
+            count = int(spec.get("count", 1))
+            seed = spec.get("seed")
+            seed = int(seed) if seed not in (None, "") else None
+        except (TypeError, ValueError):
+            raise HTTPError(400, "count and seed must be integers")
+        if not 1 <= count <= max_count:
+            raise HTTPError(400, f"count must be between 1 and {max_count}")
+        stage = spec.get("stage") or None
+        if stage is not None:
+            if stage not in LIFE_STAGES:
+                raise HTTPError(400, f"Unknown life stage {stage!r}")
+            if self.table is None:
+                raise HTTPError(400, "Trait data is not loaded")
+        return pool, count, random.Random(seed), stage
+
+    def generate(self, query):
+        """Build the JSON body for GET /generate."""
+        spec = {key: values[-1] for key, values in parse_qs(query).items()}
+        pool, count, rng, stage = self._parse_spec(spec, MAX_COUNT)
+        entries = []
+        for first, last, traits in pool.draw(count, rng, self.table, stage):
+            entry = f'{{"firstName":{first},"lastName":{last}'
+            entries.append(entry + (f',"traits":{traits}}}' if traits else "}"))
+        return (f'{{"region":{json.dumps(pool.region)},"gender":{json.dumps(pool.gender)},'
+                f'"count":{count},"names":[{",".join(entries)}]}}')
+
+    def bulk_specs(self, body):
+        """Parse and validate a POST /bulk body before anything is streamed."""
+        try:
+            specs = json.loads(body or b"null")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}")
+        if isinstance(specs, dict):
+            specs = [specs]
+        if not isinstance(specs, list) or not specs or not all(isinstance(spec, dict) for spec in specs):
+            raise HTTPError(400, "Body must be a request object or a non-empty list of them")
+        parsed = [self._parse_spec(spec, MAX_BULK_COUNT) for spec in specs]
+        if sum(count for _, count, _, _ in parsed) > MAX_BULK_COUNT:
+            raise HTTPError(400, f"A bulk request may generate at most {MAX_BULK_COUNT} names")
+        return parsed
+
+    def bulk_blocks(self, parsed):
+        """Yield NDJSON text blocks of at most STREAM_BLOCK names."""
+        for pool, count, rng, stage in parsed:
+            prefix = pool.line_prefix
+            for start in range(0, count, STREAM_BLOCK):
+                lines = []
+                for first, last, traits in pool.draw(min(STREAM_BLOCK, count - start), rng, self.table, stage):
+                    line = f'{prefix}{first},"lastName":{last}'
+                    lines.append(line + (f',"traits":{traits}}}\n' if traits else "}\n"))
+                yield "".join(lines)
+
+    def pools_body(self):
+        regions = {}
+        for region, gender in sorted(self.pools):
+            regions.setdefault(region, []).append(gender)
+        return json.dumps({"regions": regions, "stages": LIFE_STAGES if self.table else []})
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one keep-alive connection until it closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, b'{"error":"Request header too large"}', False)
+                    break
+                start = time.perf_counter()
+                try:
+                    method, target, headers, keep_alive = _parse_head(head)
+                    length = int(headers.get("content-length", 0))
+                    if not 0 <= length <= MAX_BODY:
+                        raise ValueError(f"Content-Length out of range: {length}")
+                except ValueError:
+                    await self._send(writer, 400, b'{"error":"Malformed request"}', False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                route = await self._dispatch(method, target, body, writer, keep_alive)
+                self.stats.record(route, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body, writer, keep_alive):
+        """Answer one request; returns the route label its latency is recorded under."""
+        url = urlsplit(target)
+        route = f"{method} {url.path}"
+        try:
+            if url.path == "/generate" and method == "GET":
+                await self._send(writer, 200, self.generate(url.query).encode("utf-8"), keep_alive)
+            elif url.path == "/bulk" and method == "POST":
+                await self._stream(writer, self.bulk_specs(body), keep_alive)
+            elif url.path == "/pools" and method == "GET":
+                await self._send(writer, 200, self.pools_body().encode("utf-8"), keep_alive)
+            elif url.path == "/stats" and method == "GET":
+                await self._send(writer, 200, json.dumps(self.stats.summary()).encode("utf-8"), keep_alive)
+            elif url.path in ("/generate", "/bulk", "/pools", "/stats"):
+                raise HTTPError(405, f"{method} is not allowed on {url.path}")
+            else:
+                route = "unknown"
+                raise HTTPError(404, f"No route {url.path}")
+        except HTTPError as e:
+            await self._send(writer, e.status, json.dumps({"error": str(e)}).encode("utf-8"), keep_alive)
+        return route
+
+    async def _send(self, writer, status, body, keep_alive, content_type="application/json"):
+        writer.write(_status_head(status, content_type, keep_alive) + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                     + body)
+        await writer.drain()
+
+    async def _stream(self, writer, parsed, keep_alive):
+        writer.write(_status_head(200, "application/x-ndjson", keep_alive) + b"Transfer-Encoding: chunked\r\n\r\n")
+        for block in self.bulk_blocks(parsed):
+            data = block.encode("utf-8")
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            # Waits for the client to keep up, and lets other connections run between blocks
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Serve until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER)
+        total = sum(len(pool.pool) for pool in self.pools.values())
+        print(f"[OK] Serving {len(self.pools)} pools ({total} combinations) on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def _parse_head(head):
+    """Split a request head into (method, target, headers, keep-alive); raises ValueError."""
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, target, version = request_line.split(" ")
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+    return method, target, headers, keep_alive
+
+
+def _status_head(status, content_type, keep_alive):
+    return (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: {content_type}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n").encode("latin-1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve name generation over HTTP from in-memory pools.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--combinations", default=COMBINATIONS_PATH, help="trait combination table sidecar")
+    parser.add_argument("--traits", default=TRAITS_PATH, help="traits.json, used when the sidecar is missing")
+    args = parser.parse_args()
+
+    service = NameService.load(args.names_dir, args.combinations, args.traits)
+    if service.table is None:
+        print("[INFO] No trait data found, stage= is disabled")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    for route, stats in service.stats.summary()["routes"].items():
+        print(f"{route:<20}{stats['requests']:>10} requests  p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Sub-quadratic near-duplicate finder across every region/gender name file.
+
+Spelling variants ("Hasan"/"Hassan", "Yusuf"/"Yusef", "Mansur"/"Mansoor")
+are found without comparing all pairs: each distinct name is reduced to the
+character bigrams of "^name$", MinHash signatures are computed in one
+vectorized pass from cached per-bigram hash vectors, and locality-sensitive
+hashing over bands of the signature yields candidate pairs. Candidates are
+verified against the similarity threshold (1 - Levenshtein distance / longer
+length) in vectorized batches and merged into groups with union-find; two
+groups only merge when their representatives are a verified pair as well,
+which stops short names from chaining into one giant group.
+"""
+
+import argparse
+import hashlib
+import os
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+from asset_io import NAME_LISTS, NAMES_DIR, iter_name_files, load_json, write_json
+
+DEFAULT_THRESHOLD = 0.7
+# 32 bands of 4 rows: a bigram Jaccard of 0.5 (typical for a one-letter
+# variant of a short name) becomes a candidate with probability ~0.87, and
+# unrelated names sharing a bigram or two rarely do
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 4
+# Buckets larger than this are shared by unrelated names and are skipped
+MAX_BUCKET = 32
+# Names per block when gathering bigram hash vectors, and candidate pairs per
+# block when verifying them, so neither materializes one huge array
+SIGNATURE_BLOCK = 4096
+VERIFY_BLOCK = 1 << 18
+
+_HASH_SHIFT = np.uint64(32)
+
+
+def name_key(name):
+    """Compare names case-insensitively and in one Unicode form."""
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+def bigrams(name):
+    """Return the set of character bigrams of a name with boundary markers."""
+    padded = f"^{name}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def encode_names(names):
+    """Return names as a zero-padded (len(names), longest) array of code points and their lengths."""
+    lengths = np.array([len(name) for name in names], dtype=np.int64)
+    longest = int(lengths.max()) if len(names) else 0
+    padded = "".join(name.ljust(longest, "\0") for name in names)
+    codes = np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(names), longest)
+    return codes, lengths
+
+
+def levenshtein_batch(codes, lengths, left, right):
+    """Edit distance of every pair (codes[left[k]], codes[right[k]]) at once.
+
+    Runs the Wagner-Fischer table for all pairs in lockstep: one vector
+    operation per cell of the longest pair instead of one Python step per
+    cell of every pair.
+    """
+    count = len(left)
+    len_a = lengths[left]
+    len_b = lengths[right]
+    width_a = int(len_a.max()) if count else 0
+    width_b = int(len_b.max()) if count else 0
+    codes_a = codes[left, :width_a]
+    codes_b = codes[right, :width_b]
+    rows = np.arange(count)
+
+    previous = np.broadcast_to(np.arange(width_b + 1, dtype=np.int32), (count, width_b + 1)).copy()
+    distances = previous[rows, len_b].copy()
+    current = np.empty_like(previous)
+    for i in range(1, width_a + 1):
+        current[:, 0] = i
+        # Substitution and deletion only need the previous row; insertion runs along the current one
+        upper = np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (codes_a[:, i - 1:i] != codes_b))
+        for j in range(1, width_b + 1):
+            np.minimum(upper[:, j - 1], current[:, j - 1] + 1, out=current[:, j])
+        done = len_a == i
+        distances[done] = current[rows[done], len_b[done]]
+        previous, current = current, previous
+    return distances
+
+
+class UnionFind:
+    """Disjoint sets over 0..size-1 with path halving and union by size."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+    def groups(self):
+        """Return every set with more than one member."""
+        members = defaultdict(list)
+        for item in range(len(self.parent)):
+            members[self.find(item)].append(item)
+        return [group for group in members.values() if len(group) > 1]
+
+
+class MinHasher:
+    """MinHash signatures over bigram sets, with one cached hash vector per bigram."""
+
+    def __init__(self, num_hashes=DEFAULT_BANDS * DEFAULT_ROWS, seed=0):
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd 64-bit multipliers, keep the high 32 bits
+        self.multipliers = rng.integers(1, 2**63, size=num_hashes, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.offsets = rng.integers(0, 2**63, size=num_hashes, dtype=np.uint64)
+        self.shingle_ids = {}
+        self.vectors = np.empty((0, num_hashes), dtype=np.uint32)
+
+    def _shingle_id(self, shingle):
+        shingle_id = self.shingle_ids.get(shingle)
+        if shingle_id is None:
+            shingle_id = self.shingle_ids[shingle] = len(self.shingle_ids)
+        return shingle_id
+
+    def _extend_vectors(self):
+        """Compute hash vectors for bigrams first seen since the last call."""
+        new_shingles = list(self.shingle_ids)[len(self.vectors):]
+        if not new_shingles:
+            return
+        base = np.array([int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+                         for shingle in new_shingles], dtype=np.uint64)
+        hashed = (base[:, None] * self.multipliers[None, :] + self.offsets[None, :]) >> _HASH_SHIFT
+        self.vectors = np.vstack([self.vectors, hashed.astype(np.uint32)])
+
+    def signatures(self, names):
+        """Return a (len(names), num_hashes) array of MinHash signatures."""
+        flat = []
+        starts = []
+        for name in names:
+            starts.append(len(flat))
+            flat.extend(self._shingle_id(shingle) for shingle in bigrams(name))
+        starts.append(len(flat))
+        self._extend_vectors()
+        flat = np.array(flat, dtype=np.int64)
+        starts = np.array(starts, dtype=np.int64)
+        signatures = np.empty((len(names), self.vectors.shape[1]), dtype=np.uint32)
+        for block in range(0, len(names), SIGNATURE_BLOCK):
+            block_starts = starts[block:block + SIGNATURE_BLOCK + 1]
+            gathered = self.vectors[flat[block_starts[0]:block_starts[-1]]]
+            # Every name has at least one bigram, so reduceat sees no empty segments
+            signatures[block:block + SIGNATURE_BLOCK] = np.minimum.reduceat(
+                gathered, block_starts[:-1] - block_starts[0], axis=0)
+        return signatures
+
+
+def lsh_candidates(signatures, bands, rows, seed=0, max_bucket=MAX_BUCKET):
+    """Return the unique (i, j) index pairs, i < j, that share a bucket in any band."""
+    count = len(signatures)
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    mixers = rng.integers(1, 2**63, size=rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    codes = []
+    for band in range(bands):
+        band_values = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (band_values * mixers).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate(([0], boundaries))
+        sizes = np.diff(np.concatenate((starts, [count])))
+        eligible = (sizes > 1) & (sizes <= max_bucket)
+        if not eligible.any():
+            continue
+        # Expand every bucket of size s into its s*(s-1)/2 pairs: the member at
+        # position k of its bucket pairs with the s-1-k members after it
+        bucket_sizes = sizes[eligible]
+        members = np.repeat(starts[eligible], bucket_sizes) + _ranges(bucket_sizes)
+        following = np.repeat(bucket_sizes, bucket_sizes) - 1 - _ranges(bucket_sizes)
+        firsts = np.repeat(members, following)
+        left = order[firsts]
+        right = order[firsts + 1 + _ranges(following)]
+        codes.append(np.minimum(left, right) * count + np.maximum(left, right))
+    if not codes:
+        return np.empty((0, 2), dtype=np.int64)
+    unique = np.concatenate(codes)
+    unique.sort()
+    unique = unique[np.concatenate(([True], unique[1:] != unique[:-1]))]
+    return np.stack([unique // count, unique % count], axis=1)
+
+
+def _ranges(lengths):
+    """Concatenate arange(length) for every length."""
+    total = int(lengths.sum())
+    ends = np.cumsum(lengths)
+    return np.arange(total) - np.repeat(ends - lengths, lengths)
+
+
+def find_near_duplicates(names, threshold=DEFAULT_THRESHOLD, bands=DEFAULT_BANDS, rows=DEFAULT_ROWS,
+                         seed=0, hasher=None):
+    """Group names whose edit similarity reaches the threshold; returns lists of names."""
+    hasher = hasher or MinHasher(bands * rows, seed)
+    signatures = hasher.signatures(names)
+    pairs = lsh_candidates(signatures, bands, rows, seed)
+
+    codes, lengths = encode_names(names)
+    longest = np.maximum(lengths[pairs[:, 0]], lengths[pairs[:, 1]])
+    max_distance = np.floor(longest * (1.0 - threshold) + 1e-9).astype(np.int64)
+    # Names whose lengths alone put them below the threshold are never compared,
+    # and pairs of similar length are verified together to keep blocks narrow
+    keep = np.abs(lengths[pairs[:, 0]] - lengths[pairs[:, 1]]) <= max_distance
+    pairs, longest, max_distance = pairs[keep], longest[keep], max_distance[keep]
+    order = np.argsort(longest, kind="stable")
+    pairs, max_distance = pairs[order], max_distance[order]
+
+    verified = []
+    for block in range(0, len(pairs), VERIFY_BLOCK):
+        block_pairs = pairs[block:block + VERIFY_BLOCK]
+        distances = levenshtein_batch(codes, lengths, block_pairs[:, 0], block_pairs[:, 1])
+        verified.append(block_pairs[distances <= max_distance[block:block + VERIFY_BLOCK]])
+    pairs = np.concatenate(verified) if verified else pairs
+    # Union in index order so the groups don't depend on the verification order
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    count = len(names)
+    similar = set((pairs[:, 0] * count + pairs[:, 1]).tolist())
+
+    union_find = UnionFind(count)
+    for i, j in pairs.tolist():
+        root_i, root_j = union_find.find(i), union_find.find(j)
+        # Plain single linkage chains Dana-Dania-Daria-Darin-... into one group,
+        # so two groups only merge when their representatives are a verified pair too
+        if root_i != root_j and (root_i, root_j) != (i, j) \
+                and min(root_i, root_j) * count + max(root_i, root_j) not in similar:
+            continue
+        union_find.union(i, j)
+    return [sorted(names[item] for item in group) for group in union_find.groups()]
+
+
+def load_corpus(names_dir=NAMES_DIR):
+    """Map every distinct name key to its spellings and the files/lists they appear in."""
+    corpus = {}
+    for file_path in iter_name_files(names_dir):
+        data = load_json(file_path)
+        file_name = os.path.splitext(os.path.basename(file_path))[0]
+        for list_name in NAME_LISTS:
+            for name in data.get(list_name, []):
+                entry = corpus.setdefault(name_key(name), {"spellings": set(), "where": set()})
+                entry["spellings"].add(name)
+                entry["where"].add(f"{file_name}:{list_name}")
+    return corpus
+
+
+def near_duplicate_groups(names_dir=NAMES_DIR, threshold=DEFAULT_THRESHOLD, bands=DEFAULT_BANDS,
+                          rows=DEFAULT_ROWS, seed=0):
+    """Find near-duplicate groups across every name file; returns report dictionaries."""
+    corpus = load_corpus(names_dir)
+    keys = sorted(corpus)
+    groups = []
+    for group in find_near_duplicates(keys, threshold, bands, rows, seed):
+        groups.append({
+            "names": sorted(spelling for key in group for spelling in corpus[key]["spellings"]),
+            "where": sorted(set().union(*(corpus[key]["where"] for key in group)))
+        })
+    groups.sort(key=lambda group: (-len(group["names"]), group["names"]))
+    return len(keys), groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate name spellings across all files.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum edit similarity, 1 - distance / longer length")
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="LSH bands")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="MinHash rows per band")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=50, help="groups to print")
+    parser.add_argument("--output", help="write every group to this JSON file")
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    total, groups = near_duplicate_groups(args.names_dir, args.threshold, args.bands, args.rows, args.seed)
+    for group in groups[:args.limit]:
+        print(f"{', '.join(group['names'])}  ({', '.join(group['where'])})")
+    if len(groups) > args.limit:
+        print(f"... {len(groups) - args.limit} more")
+
+    print(f"\n{len(groups)} near-duplicate groups among {total} distinct names (threshold {args.threshold})")
+    if args.output:
+        write_json(args.output, {"threshold": args.threshold, "groups": groups})
+        print(f"[OK] Groups written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Unicode-normalization-aware duplicate detection for the name files.
+
+analyze_duplicates compares exact strings, so "Māui" typed with a combining
+macron, "MĀUI" and "Maui" all count as different names. Here every name is
+mapped to a normalized key by a configurable chain of steps (nfc, nfkc,
+casefold, strip) and a single pass over all files fills one hash index from
+(scope, key) to the spellings found. Keys with more than one spelling are
+the collision groups; each group is labelled with the first step that merged
+its spellings, so NFC/NFD variants, case variants and diacritic variants can
+be told apart.
+"""
+
+import argparse
+import gc
+import os
+import unicodedata
+from collections import defaultdict
+
+from asset_io import NAME_LISTS, NAMES_DIR, iter_name_files, load_json, split_name_file_stem, write_json
+from name_index import MAX_FILES, MAX_POSITION, pack_posting, unpack_posting
+
+# Deletes every combining mark in the BMP and folds the Latin letters with a
+# stroke or ligature, which don't decompose under NFD
+_STRIP_TABLE = {codepoint: None for codepoint in range(0x10000) if unicodedata.combining(chr(codepoint))}
+_STRIP_TABLE.update(str.maketrans({
+    "ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D", "ħ": "h", "Ħ": "H",
+    "ı": "i", "ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "þ": "th", "Þ": "TH",
+}))
+
+
+def strip_diacritics(name):
+    """Remove accents and other combining marks, folding stroked letters to their base."""
+    if name.isascii():
+        return name
+    return unicodedata.normalize("NFC", unicodedata.normalize("NFD", name).translate(_STRIP_TABLE))
+
+
+# ASCII is already in every normalization form, and most names are ASCII
+NORMALIZERS = {
+    "nfc": lambda name: name if name.isascii() else unicodedata.normalize("NFC", name),
+    "nfkc": lambda name: name if name.isascii() else unicodedata.normalize("NFKC", name),
+    "casefold": str.casefold,
+    "strip": strip_diacritics,
+}
+DEFAULT_STEPS = ("nfc", "casefold", "strip")
+
+# What a group has in common with the rest of the index
+SCOPES = ("list", "file", "region", "all")
+
+
+class NormalizedKey:
+    """A chain of normalization steps, memoized per raw name."""
+
+    def __init__(self, steps=DEFAULT_STEPS):
+        unknown = [step for step in steps if step not in NORMALIZERS]
+        if unknown:
+            raise ValueError(f"Unknown normalization steps: {', '.join(unknown)}")
+        self.steps = tuple(steps)
+        self._functions = [NORMALIZERS[step] for step in self.steps]
+        # Every step leaves ASCII alone except casefold, which lowercases it
+        self._ascii_key = str.lower if "casefold" in self.steps else str
+        self._keys = {}
+
+    def stages(self, name):
+        """Return the name after each step of the chain."""
+        stages = []
+        for function in self._functions:
+            name = function(name)
+            stages.append(name)
+        return stages
+
+    def __call__(self, name):
+        return self.keys([name])[0]
+
+    def keys(self, names):
+        """Return the key of every name in a list."""
+        ascii_key = self._ascii_key
+        cache = self._keys
+        functions = self._functions
+        keys = []
+        for name in names:
+            if name.isascii():
+                keys.append(ascii_key(name))
+                continue
+            key = cache.get(name)
+            if key is None:
+                key = name
+                for function in functions:
+                    key = function(key)
+                cache[name] = key
+            keys.append(key)
+        return keys
+
+    def merged_by(self, spellings):
+        """Return the first step after which every spelling has the same value."""
+        stages = [self.stages(spelling) for spelling in spellings]
+        for index, step in enumerate(self.steps):
+            if len({spelling_stages[index] for spelling_stages in stages}) == 1:
+                return step
+        return self.steps[-1] if self.steps else "exact"
+
+
+class NormalizedDuplicateIndex:
+    """Hash index from (scope, normalized key) to every spelling and where it occurs."""
+
+    def __init__(self, key=None, scope="list"):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope {scope}; expected one of {', '.join(SCOPES)}")
+        self.key = key or NormalizedKey()
+        self.scope = scope
+        # scope id -> {key: posting} for keys seen once, or
+        # {key: {spelling: [posting, ...]}} once a key is seen again
+        self.scopes = defaultdict(dict)
+        self.files = []
+        self.lists = []
+        self.names_seen = 0
+
+    def _scope_id(self, file_name, region, list_name):
+        if self.scope == "list":
+            return f"{file_name}:{list_name}"
+        if self.scope == "file":
+            return file_name
+        if self.scope == "region":
+            return f"{region}:{list_name}"
+        return list_name
+
+    def add_file(self, file_path):
+        """Index every name of one file."""
+        file_id = len(self.files)
+        if file_id >= MAX_FILES:
+            raise ValueError(f"Too many name files for the index (max {MAX_FILES})")
+        data = load_json(file_path)
+        file_name = os.path.basename(file_path)
+        region, _ = split_name_file_stem(os.path.splitext(file_name)[0])
+        self.files.append(file_name)
+        # Keys seen once store only a packed posting; the name is read back from the list
+        self.lists.append([data.get(list_name, []) for list_name in NAME_LISTS])
+
+        for list_id, list_name in enumerate(NAME_LISTS):
+            names = self.lists[file_id][list_id]
+            if len(names) > MAX_POSITION:
+                raise ValueError(f"{file_name} {list_name} is too long for the index (max {MAX_POSITION})")
+            table = self.scopes[self._scope_id(file_name, region, list_name)]
+            base = pack_posting(file_id, list_id, 0)
+            for position, (name, name_key) in enumerate(zip(names, self.key.keys(names))):
+                entry = table.get(name_key)
+                if entry is None:
+                    table[name_key] = base + position
+                    continue
+                if not isinstance(entry, dict):
+                    entry = table[name_key] = {self._name_at(entry): [entry]}
+                if name in entry:
+                    entry[name].append(base + position)
+                else:
+                    entry[name] = [base + position]
+            self.names_seen += len(names)
+
+    def _name_at(self, posting):
+        file_id, list_id, position = unpack_posting(posting)
+        return self.lists[file_id][list_id][position]
+
+    def location(self, posting):
+        """Return the (file, list, position) of a posting."""
+        file_id, list_id, position = unpack_posting(posting)
+        return self.files[file_id], NAME_LISTS[list_id], position
+
+    def __len__(self):
+        """Number of distinct (scope, key) entries."""
+        return sum(len(table) for table in self.scopes.values())
+
+    @classmethod
+    def build(cls, names_dir=NAMES_DIR, key=None, scope="list"):
+        """Index every name file in one pass."""
+        index = cls(key, scope)
+        # Millions of small, acyclic entries would otherwise trigger repeated full collections
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for file_path in iter_name_files(names_dir):
+                index.add_file(file_path)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return index
+
+    def groups(self, include_exact=False):
+        """Yield a dict per collision group: keys with several spellings (or repeats)."""
+        for scope_id, table in self.scopes.items():
+            for key, spellings in table.items():
+                if not isinstance(spellings, dict):
+                    continue
+                if len(spellings) < 2 and not include_exact:
+                    continue
+                yield {
+                    "scope": scope_id,
+                    "key": key,
+                    "mergedBy": self.key.merged_by(list(spellings)) if len(spellings) > 1 else "exact",
+                    "spellings": {spelling: [list(self.location(posting)) for posting in postings]
+                                  for spelling, postings in spellings.items()}
+                }
+
+
+def report(groups, limit=None):
+    """Print collision groups by scope and a count per merging step."""
+    by_step = defaultdict(int)
+    shown = 0
+    for group in groups:
+        by_step[group["mergedBy"]] += 1
+        if limit is not None and shown >= limit:
+            continue
+        shown += 1
+        spellings = ", ".join(f"{spelling!r} x{len(locations)}" for spelling, locations in group["spellings"].items())
+        print(f"[{group['mergedBy']}] {group['scope']}: {spellings}")
+    return dict(by_step)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate names that only differ by normalization.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--steps", default=",".join(DEFAULT_STEPS),
+                        help=f"comma-separated normalization chain ({', '.join(NORMALIZERS)})")
+    parser.add_argument("--scope", default="list", choices=SCOPES,
+                        help="where colliding names count as duplicates")
+    parser.add_argument("--include-exact", action="store_true", help="also report exact repeats")
+    parser.add_argument("--limit", type=int, default=None, help="print at most this many groups")
+    parser.add_argument("--output", help="write the groups to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        key = NormalizedKey([step.strip() for step in args.steps.split(",") if step.strip()])
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return
+
+    index = NormalizedDuplicateIndex.build(args.names_dir, key, args.scope)
+    # The index lives until exit; keep the collector from rescanning it while groups are built
+    gc.freeze()
+    groups = list(index.groups(args.include_exact))
+    by_step = report(groups, args.limit)
+
+    print(f"\nIndexed {index.names_seen} names into {len(index)} normalized keys")
+    if not groups:
+        print("[OK] No normalization collisions found")
+    else:
+        print(f"[ERROR] {len(groups)} collision groups: "
+              + ", ".join(f"{count} merged by {step}" for step, count in by_step.items()))
+    if args.output:
+        write_json(args.output, {"steps": list(key.steps), "scope": args.scope, "groups": groups})
+        print(f"[OK] Groups written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
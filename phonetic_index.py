@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Phonetic sidecar index over every region/gender name file.
+
+Exact and edit-distance checks miss sound-alike spellings such as
+"Mahmud"/"Mahmoud" or "Yaqoob"/"Yakub". Every first and last name is folded
+to ASCII letters and given a Metaphone and a Soundex key; the index maps each
+key to the names that share it, both across all files and per file, and is
+persisted next to the name index. Loading it builds per-region tables too,
+so "all names that sound like X" in any region or file is one key
+computation and one dictionary lookup.
+"""
+
+import argparse
+import os
+from collections import defaultdict
+
+from asset_io import INDEX_DIR, NAME_LISTS, NAMES_DIR, iter_name_files, load_json, split_name_file_stem, write_json
+from normalized_duplicates import strip_diacritics
+
+INDEX_PATH = os.path.join(INDEX_DIR, "phonetic_index.json")
+INDEX_VERSION = 1
+
+DEFAULT_ALGORITHM = "metaphone"
+
+_VOWELS = frozenset("AEIOU")
+_FRONT_VOWELS = frozenset("EIY")
+# An H after these letters is part of a digraph and silent
+_H_DIGRAPHS = frozenset("CSPTG")
+# Metaphone drops the first letter of these initial pairs
+_SILENT_INITIALS = ("AE", "GN", "KN", "PN", "WR")
+
+_SOUNDEX_CODES = {}
+for _digit, _letters in enumerate(("AEIOUY", "BFPV", "CGJKQSXZ", "DT", "L", "MN", "R")):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = str(_digit)
+
+
+def fold_name(name):
+    """Return the uppercase ASCII letters of a name, with accents removed."""
+    return "".join(char for char in strip_diacritics(name).upper() if "A" <= char <= "Z")
+
+
+def soundex(name):
+    """American Soundex: first letter and three digits, e.g. Robert -> R163."""
+    letters = fold_name(name)
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter)
+        if digit is None:
+            # H and W don't separate letters with the same code
+            continue
+        if digit != "0" and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        previous = digit
+    return code.ljust(4, "0")
+
+
+def metaphone(name):
+    """Lawrence Philips' original Metaphone key of a name, e.g. Knight -> NT."""
+    word = fold_name(name)
+    if not word:
+        return ""
+    if word.startswith(_SILENT_INITIALS):
+        word = word[1:]
+    elif word[0] == "X":
+        word = "S" + word[1:]
+    elif word.startswith("WH"):
+        word = "W" + word[2:]
+
+    key = []
+    last = len(word) - 1
+    for i, char in enumerate(word):
+        prev = word[i - 1] if i > 0 else ""
+        next_char = word[i + 1] if i < last else ""
+        after_next = word[i + 2] if i + 1 < last else ""
+        if char == prev and char != "C":
+            continue
+        if char in _VOWELS:
+            if i == 0:
+                key.append(char)
+        elif char == "B":
+            if not (prev == "M" and i == last):
+                key.append("B")
+        elif char == "C":
+            if next_char == "I" and after_next == "A":
+                key.append("X")
+            elif next_char == "H":
+                key.append("K" if prev == "S" else "X")
+            elif next_char in _FRONT_VOWELS:
+                if prev != "S":
+                    key.append("S")
+            else:
+                key.append("K")
+        elif char == "D":
+            key.append("J" if next_char == "G" and after_next in _FRONT_VOWELS else "T")
+        elif char == "G":
+            if next_char == "H" and i + 1 < last and after_next not in _VOWELS:
+                continue
+            if next_char == "N" and (i + 1 == last or word[i + 1:] == "NED"):
+                continue
+            if prev == "D" and next_char in _FRONT_VOWELS:
+                continue
+            key.append("J" if next_char in _FRONT_VOWELS and prev != "G" else "K")
+        elif char == "H":
+            if prev in _H_DIGRAPHS:
+                continue
+            if prev in _VOWELS and next_char not in _VOWELS:
+                continue
+            key.append("H")
+        elif char == "K":
+            if prev != "C":
+                key.append("K")
+        elif char == "P":
+            key.append("F" if next_char == "H" else "P")
+        elif char == "Q":
+            key.append("K")
+        elif char == "S":
+            if next_char == "H" or (next_char == "I" and after_next in ("O", "A")):
+                key.append("X")
+            else:
+                key.append("S")
+        elif char == "T":
+            if next_char == "I" and after_next in ("O", "A"):
+                key.append("X")
+            elif next_char == "H":
+                key.append("0")
+            elif not (next_char == "C" and after_next == "H"):
+                key.append("T")
+        elif char == "V":
+            key.append("F")
+        elif char in "WY":
+            if next_char in _VOWELS:
+                key.append(char)
+        elif char == "X":
+            key.append("KS")
+        elif char == "Z":
+            key.append("S")
+        else:
+            key.append(char)
+    return "".join(key)
+
+
+ALGORITHMS = {
+    "metaphone": metaphone,
+    "soundex": soundex,
+}
+
+
+class PhoneticIndex:
+    """Inverted index from phonetic key to the names that share it, overall and per file."""
+
+    def __init__(self, files, names, keys, file_keys):
+        self.files = files
+        self.names = names
+        # algorithm -> {key: [name id, ...]}
+        self.keys = keys
+        # algorithm -> [{key: [name id, ...]} for each file]
+        self.file_keys = file_keys
+        self._file_ids = {(file_info["region"], file_info["gender"]): file_id
+                          for file_id, file_info in enumerate(files)}
+        self._region_keys = {algorithm: self._merge_regions(tables) for algorithm, tables in file_keys.items()}
+
+    def _merge_regions(self, tables):
+        regions = defaultdict(lambda: defaultdict(set))
+        for file_info, table in zip(self.files, tables):
+            region = regions[file_info["region"]]
+            for key, name_ids in table.items():
+                region[key].update(name_ids)
+        return {region: {key: sorted(name_ids) for key, name_ids in table.items()}
+                for region, table in regions.items()}
+
+    @classmethod
+    def build(cls, names_dir=NAMES_DIR, algorithms=tuple(ALGORITHMS)):
+        """Compute the phonetic keys of every name with a single pass over the name files."""
+        files = []
+        file_names = []
+        for file_path in iter_name_files(names_dir):
+            region, gender = split_name_file_stem(file_path.stem)
+            files.append({"region": region, "gender": gender, "file": file_path.name})
+            data = load_json(file_path)
+            file_names.append({name for list_name in NAME_LISTS for name in data.get(list_name, [])})
+
+        names = sorted(set().union(*file_names))
+        name_ids = {name: name_id for name_id, name in enumerate(names)}
+        keys = {}
+        file_keys = {}
+        for algorithm in algorithms:
+            function = ALGORITHMS[algorithm]
+            name_keys = [function(name) for name in names]
+            table = defaultdict(list)
+            for name_id, key in enumerate(name_keys):
+                if key:
+                    table[key].append(name_id)
+            keys[algorithm] = dict(table)
+
+            file_keys[algorithm] = []
+            for file_name_set in file_names:
+                file_table = defaultdict(list)
+                for name_id in sorted(name_ids[name] for name in file_name_set):
+                    if name_keys[name_id]:
+                        file_table[name_keys[name_id]].append(name_id)
+                file_keys[algorithm].append(dict(file_table))
+        return cls(files, names, keys, file_keys)
+
+    @classmethod
+    def load(cls, index_path=INDEX_PATH):
+        """Load a persisted index."""
+        data = load_json(index_path)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported phonetic index version in {index_path}")
+        return cls(data["files"], data["names"], data["keys"], data["fileKeys"])
+
+    def save(self, index_path=INDEX_PATH):
+        """Persist the index as compact JSON."""
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "algorithms": list(self.keys),
+            "files": self.files,
+            "names": self.names,
+            "keys": self.keys,
+            "fileKeys": self.file_keys
+        }
+        write_json(index_path, data, compact=True)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def algorithms(self):
+        return list(self.keys)
+
+    def key(self, name, algorithm=DEFAULT_ALGORITHM):
+        """Return the phonetic key of any name, indexed or not."""
+        if algorithm not in self.keys:
+            raise ValueError(f"Algorithm {algorithm} is not in the index ({', '.join(self.keys)})")
+        return ALGORITHMS[algorithm](name)
+
+    def sounds_like(self, name, region=None, gender=None, algorithm=DEFAULT_ALGORITHM):
+        """Return the names that share the phonetic key of name.
+
+        With a region, only names from that region's files count; with a
+        region and a gender, only names from that one file.
+        """
+        key = self.key(name, algorithm)
+        if region is None:
+            name_ids = self.keys[algorithm].get(key, ())
+        elif gender is None:
+            name_ids = self._region_keys[algorithm].get(region, {}).get(key, ())
+        else:
+            file_id = self._file_ids.get((region, gender))
+            name_ids = self.file_keys[algorithm][file_id].get(key, ()) if file_id is not None else ()
+        return [self.names[name_id] for name_id in name_ids]
+
+    def clusters(self, file_id, algorithm=DEFAULT_ALGORITHM, min_size=2):
+        """Return (key, names) sound-alike clusters of one file, largest first."""
+        clusters = [(key, [self.names[name_id] for name_id in name_ids])
+                    for key, name_ids in self.file_keys[algorithm][file_id].items() if len(name_ids) >= min_size]
+        clusters.sort(key=lambda cluster: (-len(cluster[1]), cluster[0]))
+        return clusters
+
+
+def build_phonetic_index(names_dir=NAMES_DIR, index_path=INDEX_PATH):
+    """Build and persist the phonetic index."""
+    index = PhoneticIndex.build(names_dir)
+    index.save(index_path)
+    counts = ", ".join(f"{len(keys)} {algorithm} keys" for algorithm, keys in index.keys.items())
+    print(f"[OK] Indexed {len(index)} unique names ({counts}) from {len(index.files)} files into {index_path}")
+    return index
+
+
+def report(index, algorithm=DEFAULT_ALGORITHM, top=5):
+    """Print the largest sound-alike clusters of every file."""
+    for file_id, file_info in enumerate(index.files):
+        clusters = index.clusters(file_id, algorithm)
+        print(f"{file_info['file']}: {len(clusters)} clusters")
+        for key, names in clusters[:top]:
+            print(f"  {key:<8} {', '.join(names)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the phonetic name index.")
+    parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    parser.add_argument("--index", default=INDEX_PATH, help="path of the persisted index")
+    parser.add_argument("--algorithm", default=DEFAULT_ALGORITHM, choices=list(ALGORITHMS))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="build and save the index")
+    query_parser = subparsers.add_parser("query", help="show names that sound like the given ones")
+    query_parser.add_argument("names", nargs="+")
+    query_parser.add_argument("--region")
+    query_parser.add_argument("--gender")
+    report_parser = subparsers.add_parser("report", help="show the largest sound-alike clusters per file")
+    report_parser.add_argument("--top", type=int, default=5, help="clusters to show per file")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_phonetic_index(args.names_dir, args.index)
+        return
+
+    index = PhoneticIndex.load(args.index)
+    if args.command == "query":
+        for name in args.names:
+            matches = index.sounds_like(name, args.region, args.gender, args.algorithm)
+            key = index.key(name, args.algorithm)
+            print(f"{name} [{key}]: {', '.join(matches) if matches else 'no matches'}")
+    elif args.command == "report":
+        report(index, args.algorithm, args.top)
+
+
+if __name__ == "__main__":
+    main()
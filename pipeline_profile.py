@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Shared phase-timing and profiling instrumentation for the pipeline scripts.
+
+Scripts wrap their work in phase("load"), phase("parse"), phase("dedupe"),
+phase("serialize") and phase("write") blocks and report file sizes with
+record_file(); both are no-ops unless instrumentation is active. Running any
+script with --profile activates it, writes cProfile/pstats output and a JSON
+report with per-phase wall and CPU time and per-file byte counts.
+
+--memory traces allocations with tracemalloc instead: every phase and every
+file wrapped in track_file() records its peak and its top allocation sites,
+and --memory-budget aborts the run as soon as a phase or file boundary sees
+the traced peak go over the budget.
+"""
+
+import argparse
+import cProfile
+import contextlib
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+PROFILE_DIR = "profiles"
+MEMORY_TOP = 10
+
+_active = None
+
+
+class MemoryBudgetExceeded(BaseException):
+    """Raised when the traced memory peak goes over the configured budget.
+
+    Derives from BaseException so the scripts' per-file "except Exception"
+    handlers don't swallow the abort and carry on with the next file.
+    """
+
+    def __init__(self, scope, peak, budget):
+        super().__init__(f"Memory budget exceeded in {scope}: peak {peak / 2**20:.1f} MiB "
+                         f"> budget {budget / 2**20:.1f} MiB")
+        self.scope = scope
+        self.peak = peak
+        self.budget = budget
+
+
+class MemoryTracker:
+    """Nested tracemalloc peak and allocation-site tracking.
+
+    tracemalloc only keeps one global peak, so each scope resets it on entry
+    and hands its own peak back to the enclosing scope on exit. Allocation
+    sites are kept from the call whose peak grew the most over the memory it
+    started with (peak_growth_bytes, which unlike the absolute peak doesn't
+    creep up with whatever earlier calls left alive). Every call takes a
+    snapshot on entry, but comparing it, which costs time proportional to
+    everything alive, only happens when the call beats the recorded growth.
+    """
+
+    def __init__(self, budget=None, top=MEMORY_TOP):
+        self.budget = budget
+        self.top = top
+        self.peak = 0
+        self._stack = []
+        self._ignored = {tracemalloc.__file__, __file__}
+
+    def start(self):
+        tracemalloc.start()
+        self._stack = [0]
+
+    def stop(self):
+        self.peak = max(self._stack[0], tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def measure(self, scope, stats):
+        """Track a scope's peak and allocation sites into a stats dictionary."""
+        current, peak = tracemalloc.get_traced_memory()
+        self._stack[-1] = max(self._stack[-1], peak)
+        self._check(scope, self._stack[-1])
+        before = tracemalloc.take_snapshot() if self.top else None
+        tracemalloc.reset_peak()
+        self._stack.append(current)
+        try:
+            yield
+        finally:
+            scope_peak = max(self._stack.pop(), tracemalloc.get_traced_memory()[1])
+            sites = None
+            if before is not None and scope_peak - current > stats.get("peak_growth_bytes", -1):
+                sites = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            self._stack[-1] = max(self._stack[-1], scope_peak)
+            self._record(stats, current, scope_peak, sites)
+        self._check(scope, scope_peak)
+
+    def _record(self, stats, start, peak, sites):
+        stats["calls"] = stats.get("calls", 0) + 1
+        stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak)
+        if peak - start > stats.get("peak_growth_bytes", -1):
+            stats["peak_growth_bytes"] = peak - start
+            # 1-based call that grew the most (and, with sites, whose sites are kept)
+            stats["peak_call"] = stats["calls"]
+        if sites is not None:
+            stats["top_sites"] = [
+                {
+                    "site": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                    "size_diff": diff.size_diff,
+                    "count_diff": diff.count_diff
+                }
+                for diff in sites if diff.size_diff > 0 and diff.traceback[0].filename not in self._ignored
+            ][:self.top]
+
+    def _check(self, scope, peak):
+        if self.budget is not None and peak > self.budget:
+            raise MemoryBudgetExceeded(scope, peak, self.budget)
+
+
+class Instrumentation:
+    """Collects phase timings, file byte counts and optional memory peaks for one script run."""
+
+    def __init__(self, script, memory=None):
+        self.script = script
+        self.phases = {}
+        self.files = []
+        self.memory = memory
+        self.memory_phases = {}
+        self.memory_files = {}
+        self.started = datetime.now(timezone.utc).isoformat()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.wall_s = None
+        self.cpu_s = None
+        if memory:
+            memory.start()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block of work under a phase name (inclusive of nested phases)."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            if self.memory:
+                with self.memory.measure(f"phase {name}", self.memory_phases.setdefault(name, {})):
+                    yield
+            else:
+                yield
+        finally:
+            stats = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+            stats["wall_s"] += time.perf_counter() - wall_start
+            stats["cpu_s"] += time.process_time() - cpu_start
+            stats["calls"] += 1
+
+    @contextlib.contextmanager
+    def track_file(self, path):
+        """Record the memory peak of processing one file (memory mode only)."""
+        if not self.memory:
+            yield
+            return
+        with self.memory.measure(f"file {path}", self.memory_files.setdefault(str(path), {})):
+            yield
+
+    def record_file(self, path, num_bytes, operation):
+        """Record that a file was read or written."""
+        self.files.append({"path": str(path), "operation": operation, "bytes": num_bytes})
+
+    def finish(self):
+        self.wall_s = time.perf_counter() - self._wall_start
+        self.cpu_s = time.process_time() - self._cpu_start
+        if self.memory and tracemalloc.is_tracing():
+            self.memory.stop()
+
+    def report(self):
+        """Return the structured report as a dictionary."""
+        totals = {}
+        for entry in self.files:
+            key = f"bytes_{entry['operation']}"
+            totals[key] = totals.get(key, 0) + entry["bytes"]
+        report = {
+            "script": self.script,
+            "started": self.started,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "phases": self.phases,
+            "files": self.files,
+            "totals": totals
+        }
+        if self.memory:
+            report["memory"] = {
+                "peak_bytes": self.memory.peak,
+                "budget_bytes": self.memory.budget,
+                "phases": self.memory_phases,
+                "files": self.memory_files
+            }
+        return report
+
+
+def active():
+    """Return the active Instrumentation, or None."""
+    return _active
+
+
+def activate(instrumentation):
+    """Make an Instrumentation the active one (None deactivates)."""
+    global _active
+    _active = instrumentation
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Time a block under the active instrumentation; a no-op when inactive."""
+    if _active is None:
+        yield
+        return
+    with _active.phase(name):
+        yield
+
+
+def record_file(path, num_bytes, operation):
+    """Record a file read or write under the active instrumentation."""
+    if _active is not None:
+        _active.record_file(path, num_bytes, operation)
+
+
+@contextlib.contextmanager
+def track_file(path):
+    """Track the memory peak of processing one file; a no-op outside memory mode."""
+    if _active is None:
+        yield
+        return
+    with _active.track_file(path):
+        yield
+
+
+def add_profile_arguments(parser):
+    """Add the --profile and --memory switches to a script's argument parser."""
+    parser.add_argument("--profile", action="store_true",
+                        help="write cProfile stats and a phase-timing JSON report")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace allocations and report peaks and top sites per phase and file")
+    parser.add_argument("--memory-budget", type=float, metavar="MIB",
+                        help="abort when the traced peak exceeds this many MiB (implies --memory)")
+    parser.add_argument("--memory-top", type=int, default=MEMORY_TOP,
+                        help="allocation sites to keep per phase and file")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="directory for profiling output")
+    return parser
+
+
+def run_profiled(script, args, func, *func_args, **func_kwargs):
+    """Run func, instrumented when args.profile, args.memory or args.memory_budget is set."""
+    profile = getattr(args, "profile", False)
+    budget = getattr(args, "memory_budget", None)
+    memory = getattr(args, "memory", False) or budget is not None
+    if not profile and not memory:
+        return func(*func_args, **func_kwargs)
+
+    tracker = None
+    if memory:
+        tracker = MemoryTracker(int(budget * 2**20) if budget is not None else None,
+                                getattr(args, "memory_top", MEMORY_TOP))
+    instrumentation = Instrumentation(script, tracker)
+    # cProfile and tracemalloc distort each other's numbers, so only profile when asked
+    profiler = cProfile.Profile() if profile else None
+    exceeded = None
+    activate(instrumentation)
+    try:
+        if profiler:
+            profiler.enable()
+        try:
+            result = func(*func_args, **func_kwargs)
+        except MemoryBudgetExceeded as e:
+            exceeded = e
+            result = None
+        finally:
+            if profiler:
+                profiler.disable()
+            instrumentation.finish()
+    finally:
+        activate(None)
+
+    os.makedirs(args.profile_dir, exist_ok=True)
+    report = instrumentation.report()
+    outputs = []
+    if profiler:
+        stats_path = os.path.join(args.profile_dir, f"{script}.pstats")
+        profiler.dump_stats(stats_path)
+        report["pstats"] = stats_path
+        outputs.append(stats_path)
+    if exceeded:
+        report["memory"]["aborted"] = str(exceeded)
+    report_path = os.path.join(args.profile_dir, f"{script}_{'profile' if profile else 'memory'}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    outputs.append(report_path)
+
+    if profiler:
+        print_summary(report, sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+    if tracker:
+        print_memory_summary(report, sys.stderr)
+    print(f"[OK] Profile written to {' and '.join(outputs)}", file=sys.stderr)
+    if exceeded:
+        sys.exit(f"[ERROR] {exceeded}")
+    return result
+
+
+def print_summary(report, stream=sys.stdout):
+    """Print the phase table of a report."""
+    print(f"\n{'phase':<12}{'calls':>8}{'wall s':>10}{'cpu s':>10}", file=stream)
+    for name, stats in report["phases"].items():
+        print(f"{name:<12}{stats['calls']:>8}{stats['wall_s']:>10.4f}{stats['cpu_s']:>10.4f}", file=stream)
+    print(f"{'total':<12}{'':>8}{report['wall_s']:>10.4f}{report['cpu_s']:>10.4f}", file=stream)
+    for key, value in report["totals"].items():
+        print(f"{key}: {value}", file=stream)
+
+
+def print_memory_summary(report, stream=sys.stdout, files=10):
+    """Print the memory peaks of a report: every phase and the largest files."""
+    memory = report["memory"]
+    print(f"\n{'memory scope':<40}{'peak MiB':>10}{'growth MiB':>12}  top site", file=stream)
+    scopes = [(f"phase {name}", stats) for name, stats in memory["phases"].items()]
+    largest = sorted(memory["files"].items(), key=lambda item: -item[1].get("peak_bytes", 0))[:files]
+    scopes += [(os.path.basename(path), stats) for path, stats in largest]
+    for scope, stats in scopes:
+        site = stats["top_sites"][0]["site"] if stats.get("top_sites") else ""
+        print(f"{scope:<40}{stats.get('peak_bytes', 0) / 2**20:>10.2f}"
+              f"{stats.get('peak_growth_bytes', 0) / 2**20:>12.2f}  {site}", file=stream)
+    print(f"{'total peak':<40}{memory['peak_bytes'] / 2**20:>10.2f}", file=stream)
+
+
+def run_script(script, func, description=None):
+    """Entry point for scripts without their own arguments: parse --profile and run func."""
+    parser = add_profile_arguments(argparse.ArgumentParser(description=description))
+    args = parser.parse_args()
+    return run_profiled(script, args, func)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic name datasets for stress testing.
+
+Writes region/gender JSON files in exactly the schema and formatting the
+generators use (region, gender, firstNames, lastNames) at any size, with a
+controllable duplicate rate, share of accented names (Māori macrons,
+Lithuanian and Central European diacritics, optionally NFD-decomposed) and
+name-length distribution. The same seed always produces the same files.
+"""
+
+import argparse
+import os
+import random
+import unicodedata
+
+from asset_io import name_file_name, name_payload, write_json
+
+REGIONS = [
+    "english", "north_african", "subSaharanAfrican", "east_african", "southAfrican",
+    "centralEuropean", "northernEuropean", "easternEuropean", "middleEastern",
+    "southAsian", "eastAsian", "oceania", "lithuanian",
+]
+GENDERS = ["male", "female"]
+
+CONSONANTS = "bcdfghjklmnprstvwyz"
+VOWELS = "aeiou"
+ONSETS = ["ch", "sh", "th", "kr", "st", "br", "gr", "wh", "ng"]
+
+# Accented replacements per base letter, by script family
+DIACRITICS = {
+    "maori": {"a": "ā", "e": "ē", "i": "ī", "o": "ō", "u": "ū"},
+    "lithuanian": {"a": "ą", "c": "č", "e": "ė", "i": "į", "s": "š", "u": "ų", "z": "ž"},
+    "central_european": {"c": "ć", "e": "ě", "l": "ł", "n": "ń", "o": "ó", "r": "ř", "s": "ś", "z": "ż"},
+}
+
+
+class DatasetConfig:
+    """Knobs for one synthetic dataset."""
+
+    def __init__(self, first_names=1000, last_names=1000, duplicate_rate=0.0, unicode_rate=0.0,
+                 nfd_rate=0.0, length_mean=6.0, length_stddev=2.0, min_length=2, max_length=14, seed=0):
+        if not 0 <= duplicate_rate < 1:
+            raise ValueError("duplicate_rate must be in [0, 1)")
+        if min_length < 2 or max_length < min_length:
+            raise ValueError("Name lengths must satisfy 2 <= min_length <= max_length")
+        self.first_names = first_names
+        self.last_names = last_names
+        self.duplicate_rate = duplicate_rate
+        self.unicode_rate = unicode_rate
+        self.nfd_rate = nfd_rate
+        self.length_mean = length_mean
+        self.length_stddev = length_stddev
+        self.min_length = min_length
+        self.max_length = max_length
+        self.seed = seed
+
+
+def _name_length(rng, config):
+    length = round(rng.gauss(config.length_mean, config.length_stddev))
+    return max(config.min_length, min(config.max_length, length))
+
+
+def _base_name(rng, length):
+    """Build a pronounceable lowercase name of exactly length letters."""
+    letters = []
+    if rng.random() < 0.2:
+        letters.append(rng.choice(ONSETS))
+    elif rng.random() < 0.5:
+        letters.append(rng.choice(CONSONANTS))
+    vowel_next = True
+    while sum(len(part) for part in letters) < length:
+        letters.append(rng.choice(VOWELS if vowel_next else CONSONANTS))
+        vowel_next = not vowel_next
+    return "".join(letters)[:length]
+
+
+def _accent(rng, name):
+    """Replace one or two letters with diacritics from a single script family."""
+    table = DIACRITICS[rng.choice(sorted(DIACRITICS))]
+    positions = [i for i, letter in enumerate(name) if letter in table]
+    if not positions:
+        return name
+    letters = list(name)
+    for position in rng.sample(positions, min(len(positions), rng.choice((1, 2)))):
+        letters[position] = table[letters[position]]
+    return "".join(letters)
+
+
+def generate_names(rng, count, config):
+    """Generate count names with the configured duplicates, accents and lengths."""
+    duplicates = int(count * config.duplicate_rate)
+    unique_count = count - duplicates
+
+    seen = set()
+    names = []
+    attempts = 0
+    while len(names) < unique_count:
+        attempts += 1
+        name = _base_name(rng, _name_length(rng, config))
+        if rng.random() < config.unicode_rate:
+            name = _accent(rng, name)
+        name = name[0].upper() + name[1:]
+        if name in seen:
+            # Short length ranges run out of combinations; widen with a numeric suffix
+            if attempts > unique_count * 20:
+                name = f"{name}{len(names)}"
+            else:
+                continue
+        seen.add(name)
+        names.append(name)
+
+    if duplicates and names:
+        names.extend(rng.choices(names, k=duplicates))
+        rng.shuffle(names)
+
+    if config.nfd_rate:
+        names = [unicodedata.normalize("NFD", name) if not name.isascii() and rng.random() < config.nfd_rate
+                 else name for name in names]
+    return names
+
+
+def generate_dataset(output_dir, config, regions=REGIONS, genders=GENDERS):
+    """Write one synthetic file per region/gender; returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for region in regions:
+        # Every region shares its last names between genders, like the real files
+        last_rng = random.Random(f"{config.seed}:{region}:lastNames")
+        last_names = generate_names(last_rng, config.last_names, config)
+        for gender in genders:
+            first_rng = random.Random(f"{config.seed}:{region}:{gender}:firstNames")
+            first_names = generate_names(first_rng, config.first_names, config)
+            path = os.path.join(output_dir, name_file_name(region, gender))
+            write_json(path, name_payload(region, gender, first_names, last_names))
+            paths.append(path)
+            print(f"Generated {os.path.basename(path)} with {len(first_names)} first names and {len(last_names)} last names")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic name files.")
+    parser.add_argument("--output-dir", required=True, help="directory to write the files to")
+    parser.add_argument("--regions", default=",".join(REGIONS), help="comma-separated regions")
+    parser.add_argument("--genders", default=",".join(GENDERS), help="comma-separated genders")
+    parser.add_argument("--first-names", type=int, default=1000, help="first names per file")
+    parser.add_argument("--last-names", type=int, default=1000, help="last names per region")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="share of entries that repeat a name")
+    parser.add_argument("--unicode-rate", type=float, default=0.0, help="share of names carrying diacritics")
+    parser.add_argument("--nfd-rate", type=float, default=0.0, help="share of accented names written in NFD")
+    parser.add_argument("--length-mean", type=float, default=6.0)
+    parser.add_argument("--length-stddev", type=float, default=2.0)
+    parser.add_argument("--min-length", type=int, default=2)
+    parser.add_argument("--max-length", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = DatasetConfig(args.first_names, args.last_names, args.duplicate_rate, args.unicode_rate,
+                           args.nfd_rate, args.length_mean, args.length_stddev, args.min_length,
+                           args.max_length, args.seed)
+    regions = [region for region in args.regions.split(",") if region]
+    genders = [gender for gender in args.genders.split(",") if gender]
+    paths = generate_dataset(args.output_dir, config, regions, genders)
+    print(f"[OK] Wrote {len(paths)} files to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Streaming command-line name generator.
+
+    python -m sims4names generate --region english --gender male --count 10000000 --format ndjson --seed 42
+
+Names come from the generated region/gender JSON files and trait sets from
+traits.json (through the trait combination table, so every set is valid for
+its life stage). Output is a generator pipeline of fixed-size blocks: each
+block is a vectorized draw of indices, and every name and trait set is
+escaped for the output format once up front, so a block is a single join
+over pre-encoded fragments. Weighted lists draw through alias tables, so
+they cost the same as uniform ones. Memory is bounded by the block size whatever
+--count is.
+
+Every block draws from its own generator split off the seed (see
+splittable_rng), so --workers renders blocks in parallel processes and the
+output for a seed and count is byte-identical for any number of workers.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from asset_io import NAMES_DIR
+from alias_tables import ALIAS_TABLES_PATH, AliasTable, load_alias_tables, load_weights
+from name_pool import NamePool
+from splittable_rng import block_generator, iter_blocks, resolve_seed
+from trait_combinations import COMBINATIONS_PATH, LIFE_STAGES, TraitCombinationTable
+from trait_index import TRAITS_PATH
+
+FORMATS = ("ndjson", "csv")
+CSV_TRAIT_SEPARATOR = ";"
+# Blocks each worker may have rendered ahead of the writer
+BLOCKS_IN_FLIGHT = 2
+
+_worker_stream = None
+
+
+def csv_field(value):
+    """Quote a CSV field when it contains a separator, quote or line break."""
+    if any(char in value for char in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def json_string(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+class NameStream:
+    """Pre-encoded output fragments for one pool, rendered in independently seeded blocks."""
+
+    def __init__(self, pool, output_format="ndjson", table=None, stage=None, alias_tables=(None, None)):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown format {output_format}; expected one of {', '.join(FORMATS)}")
+        self.output_format = output_format
+        self.first_alias, self.last_alias = alias_tables
+        with_traits = stage is not None
+        end = "" if with_traits else ("}\n" if output_format == "ndjson" else "\n")
+
+        if output_format == "ndjson":
+            first = [f'{{"firstName":{json_string(name)},"lastName":' for name in pool.first_names]
+            last = [json_string(name) + end for name in pool.last_names]
+        else:
+            first = [csv_field(name) + "," for name in pool.first_names]
+            last = [csv_field(name) + ("," if with_traits else end) for name in pool.last_names]
+        self.first_fragments = np.array(first, dtype=object)
+        self.last_fragments = np.array(last, dtype=object)
+
+        self.trait_fragments = None
+        if with_traits:
+            sets = (table.unrank(stage, rank) for rank in range(table.count(stage)))
+            if output_format == "ndjson":
+                traits = [f',"traits":{json.dumps(ids, separators=(",", ":"))}}}\n' for ids in sets]
+            else:
+                traits = [csv_field(CSV_TRAIT_SEPARATOR.join(ids)) + "\n" for ids in sets]
+            self.trait_fragments = np.array(traits, dtype=object)
+
+    def header(self):
+        """Return the text that precedes the first chunk."""
+        if self.output_format == "csv":
+            return "firstName,lastName,traits\n" if self.trait_fragments is not None else "firstName,lastName\n"
+        return ""
+
+    def render(self, seed, block, size):
+        """Return the text of one block of size names."""
+        rng = block_generator(seed, block)
+        columns = 2 if self.trait_fragments is None else 3
+        # Fragments interleaved in one array, so the block is a single join
+        parts = np.empty(size * columns, dtype=object)
+        parts[0::columns] = _draw(rng, self.first_fragments, size, self.first_alias)
+        parts[1::columns] = _draw(rng, self.last_fragments, size, self.last_alias)
+        if columns == 3:
+            parts[2::columns] = _draw(rng, self.trait_fragments, size, None)
+        return "".join(parts)
+
+    def chunks(self, count, seed):
+        """Yield the output for count names as the text of consecutive blocks."""
+        for block, size in iter_blocks(count):
+            yield self.render(seed, block, size)
+
+
+def _draw(rng, fragments, size, alias_table):
+    if alias_table is None:
+        return fragments[rng.integers(len(fragments), size=size)]
+    return fragments[alias_table.sample(rng, size)]
+
+
+def encode_chunks(chunks):
+    for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+
+def _init_worker(args):
+    global _worker_stream
+    _worker_stream = load_stream(args)
+
+
+def _render_block(seed, block, size):
+    return _worker_stream.render(seed, block, size).encode("utf-8")
+
+
+def parallel_chunks(args, seed, workers):
+    """Yield the encoded blocks of a run rendered by worker processes, in order.
+
+    Only a few blocks per worker are in flight at a time, so a slow reader
+    keeps memory bounded instead of letting the workers run ahead.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(args,)) as executor:
+        pending = deque()
+        for block, size in iter_blocks(args.count):
+            pending.append(executor.submit(_render_block, seed, block, size))
+            if len(pending) >= workers * BLOCKS_IN_FLIGHT:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_stream(args):
+    """Load the pool, alias tables and trait table named by the parsed generate arguments."""
+    try:
+        pool = NamePool.load(args.region, args.gender, args.names_dir)
+    except FileNotFoundError:
+        sys.exit(f"[ERROR] No name file for region {args.region!r} and gender {args.gender!r} in {args.names_dir}")
+    alias_tables = (None, None)
+    if args.weights:
+        alias_tables = tuple(AliasTable.from_weights(vector) if vector is not None else None
+                             for vector in load_weights(args.weights, pool.first_names, pool.last_names))
+    elif args.weighted:
+        try:
+            alias_tables = load_alias_tables(pool, args.alias_tables)
+        except (FileNotFoundError, ValueError) as e:
+            sys.exit(f"[ERROR] {e}")
+    table = None
+    if args.traits:
+        table = TraitCombinationTable.from_assets(args.combinations, args.traits_file)
+
+    return NameStream(pool, args.format, table, args.traits, alias_tables)
+
+
+def generate(args, out, seed):
+    """Stream args.count names for the parsed generate arguments; returns the count written."""
+    stream = load_stream(args)
+    out.write(stream.header().encode("utf-8"))
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1 and args.count > 0:
+        blocks = parallel_chunks(args, seed, workers)
+    else:
+        blocks = encode_chunks(stream.chunks(args.count, seed))
+    for block in blocks:
+        out.write(block)
+    out.flush()
+    return args.count
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="sims4names", description="Generate Sims 4 names from the name assets.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate_parser = subparsers.add_parser("generate", help="stream generated names to stdout")
+    generate_parser.add_argument("--region", required=True)
+    generate_parser.add_argument("--gender", required=True, choices=["male", "female"])
+    generate_parser.add_argument("--count", type=int, default=10)
+    generate_parser.add_argument("--format", default="ndjson", choices=FORMATS)
+    generate_parser.add_argument("--seed", type=int, default=None,
+                                 help="non-negative seed; without one, fresh entropy is drawn and reported")
+    generate_parser.add_argument("--traits", metavar="STAGE", choices=LIFE_STAGES,
+                                 help="attach a valid trait set for this life stage to every name")
+    generate_parser.add_argument("--weights", help="JSON file with per-name weights")
+    generate_parser.add_argument("--weighted", action="store_true", help="draw with the built alias tables")
+    generate_parser.add_argument("--alias-tables", default=ALIAS_TABLES_PATH, help="alias table sidecar")
+    generate_parser.add_argument("--names-dir", default=NAMES_DIR, help="directory containing the name files")
+    generate_parser.add_argument("--combinations", default=COMBINATIONS_PATH, help="trait combination table sidecar")
+    generate_parser.add_argument("--traits-file", default=TRAITS_PATH,
+                                 help="traits.json; the table is rebuilt from it when the sidecar is missing or stale")
+    generate_parser.add_argument("--workers", type=int, default=1,
+                                 help="worker processes to render blocks with (0 = one per CPU); output is identical")
+    generate_parser.add_argument("--quiet", action="store_true", help="do not report throughput on stderr")
+    args = parser.parse_args()
+
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    try:
+        seed = resolve_seed(args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.seed is None and not args.quiet:
+        print(f"[INFO] Seed {seed}", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        count = generate(args, sys.stdout.buffer, seed)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        rate = count / elapsed if elapsed else float("inf")
+        print(f"[OK] Generated {count} names in {elapsed:.2f}s ({rate:,.0f} names/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Content-addressed snapshot store for asset files.
+
+Replaces the *_backup.json copies that used to sit next to every name file.
+File contents are stored once per SHA-256 under .snapshots/objects/, outside
+the bundled assets tree. A new version of a file that has been snapshotted
+before is stored as a zlib stream primed with the previous version as its
+preset dictionary, so an edit that removes a few duplicates costs a few
+hundred bytes. Each snapshot records the paths and hashes it captured and
+can be listed and restored by ID.
+"""
+
+import argparse
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+
+from asset_io import BACKUP_SUFFIX, NAMES_DIR, content_hash, write_atomic, write_bytes
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(REPO_ROOT, ".snapshots")
+
+# Restoring a delta decompresses its whole chain, so chains are kept short
+MAX_DELTA_CHAIN = 16
+# Deflate only looks back 32 KiB, so a larger dictionary doesn't help
+MAX_DICTIONARY = 32 * 1024
+
+_FULL = b"F"
+_DELTA = b"D"
+
+
+class SnapshotStore:
+    """Deduplicated, delta-compressed snapshots of files."""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.log_path = os.path.join(root, "snapshots.jsonl")
+        # {path key: digest} of the newest version of every path, read from the log once
+        self._latest = None
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.exists(self._object_path(digest))
+
+    def put(self, data, base=None):
+        """Store bytes (as a delta against the base digest when given); returns their digest."""
+        digest = content_hash(data)
+        if self.has(digest):
+            return digest
+
+        if base and base != digest and self.has(base) and self._chain_length(base) < MAX_DELTA_CHAIN:
+            compressor = zlib.compressobj(9, zdict=self.get(base)[-MAX_DICTIONARY:])
+            blob = _DELTA + base.encode("ascii") + compressor.compress(data) + compressor.flush()
+        else:
+            blob = _FULL + zlib.compress(data, 9)
+
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, blob)
+        return digest
+
+    def _read_object(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            return f.read()
+
+    def _chain_length(self, digest):
+        length = 0
+        blob = self._read_object(digest)
+        while blob[:1] == _DELTA:
+            length += 1
+            blob = self._read_object(blob[1:65].decode("ascii"))
+        return length
+
+    def get(self, digest):
+        """Return the bytes stored under a digest."""
+        blob = self._read_object(digest)
+        if blob[:1] == _FULL:
+            return zlib.decompress(blob[1:])
+        base = self.get(blob[1:65].decode("ascii"))
+        decompressor = zlib.decompressobj(zdict=base[-MAX_DICTIONARY:])
+        return decompressor.decompress(blob[65:]) + decompressor.flush()
+
+    def snapshots(self, path=None):
+        """Return every snapshot record, oldest first, optionally only those containing a path."""
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        if path is not None:
+            key = _path_key(path)
+            records = [record for record in records if key in record["files"]]
+        return records
+
+    def find(self, snapshot_id):
+        """Return the snapshot whose ID starts with snapshot_id."""
+        matches = [record for record in self.snapshots() if record["id"].startswith(snapshot_id)]
+        if not matches:
+            raise KeyError(f"No snapshot {snapshot_id}")
+        if len({record["id"] for record in matches}) > 1:
+            raise KeyError(f"Snapshot ID {snapshot_id} is ambiguous")
+        return matches[-1]
+
+    def _latest_digests(self):
+        if self._latest is None:
+            self._latest = {}
+            for record in self.snapshots():
+                self._latest.update(record["files"])
+        return self._latest
+
+    def snapshot(self, paths, label=""):
+        """Capture the current contents of files; returns the snapshot record."""
+        contents = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                contents[path] = f.read()
+        return self.snapshot_contents(contents, label)
+
+    def snapshot_contents(self, contents, label=""):
+        """Capture {path: bytes} the caller has already read; returns the snapshot record."""
+        latest = self._latest_digests()
+        files = {}
+        for path, data in contents.items():
+            key = _path_key(path)
+            files[key] = self.put(data, base=latest.get(key))
+        return self.record(files, label)
+
+    def record(self, files, label="", created=None):
+        """Append a snapshot of already stored {path: digest} entries; returns the record."""
+        created = created or datetime.now(timezone.utc).isoformat()
+        record = {
+            "id": content_hash(json.dumps([created, label, files], sort_keys=True))[:12],
+            "created": created,
+            "label": label,
+            "files": files
+        }
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self._latest is not None:
+            self._latest.update(files)
+        return record
+
+    def restore(self, snapshot_id, paths=None, output_dir=None):
+        """Write files back from a snapshot; returns the restored paths.
+
+        Files go back to their recorded paths, or under output_dir when given;
+        raises ValueError rather than write outside output_dir.
+        """
+        record = self.find(snapshot_id)
+        keys = record["files"] if paths is None else [_path_key(path) for path in paths]
+        targets = {}
+        for key in keys:
+            if key not in record["files"]:
+                raise KeyError(f"Snapshot {record['id']} does not contain {key}")
+            targets[key] = _restore_target(key, output_dir)
+        for key, target in targets.items():
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            write_bytes(target, self.get(record["files"][key]))
+        return list(targets.values())
+
+    def stats(self):
+        """Return (object count, stored bytes, logical bytes of every snapshotted file)."""
+        count = 0
+        stored = 0
+        for path in Path(self.objects_dir).glob("*/*"):
+            count += 1
+            stored += path.stat().st_size
+        logical = sum(len(self.get(digest)) for record in self.snapshots() for digest in record["files"].values())
+        return count, stored, logical
+
+
+def _path_key(path):
+    """Normalize a path to the form recorded in snapshots (forward slashes).
+
+    Files inside the repo are keyed relative to its root, anything else by its
+    absolute path.
+    """
+    absolute = os.path.abspath(path)
+    try:
+        relative = os.path.relpath(absolute, REPO_ROOT)
+    except ValueError:
+        # Windows paths on another drive have no relative form
+        return Path(absolute).as_posix()
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return Path(absolute).as_posix()
+    return Path(relative).as_posix()
+
+
+def _restore_target(key, output_dir=None):
+    """Return where a snapshotted file is written back to.
+
+    Without output_dir that is the recorded path; with it, the key minus any
+    root, drive or parent parts, which must stay inside output_dir.
+    """
+    if not output_dir:
+        return os.path.join(REPO_ROOT, key)
+    parts = [part for part in PurePosixPath(key).parts if part not in ("/", os.curdir, os.pardir)]
+    if parts and parts[0].endswith(":"):
+        parts = parts[1:]
+    root = os.path.realpath(output_dir)
+    target = os.path.join(output_dir, *parts)
+    if not parts or os.path.commonpath([root, os.path.realpath(target)]) != root:
+        raise ValueError(f"Refusing to restore {key} outside {output_dir}")
+    return target
+
+
+def import_backups(store, names_dir=NAMES_DIR, delete=False):
+    """Move *_backup.json copies into the store as the previous versions of their files."""
+    imported = []
+    for backup_path in sorted(Path(names_dir).glob(f"*{BACKUP_SUFFIX}")):
+        original_path = backup_path.with_name(backup_path.name[:-len(BACKUP_SUFFIX)] + ".json")
+        with open(backup_path, 'rb') as f:
+            digest = store.put(f.read())
+        created = datetime.fromtimestamp(backup_path.stat().st_mtime, timezone.utc).isoformat()
+        imported.append(store.record({_path_key(original_path): digest}, f"imported {backup_path.name}", created))
+        if delete:
+            backup_path.unlink()
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save, list and restore asset snapshots.")
+    parser.add_argument("--store", default=SNAPSHOT_DIR, help="snapshot store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = subparsers.add_parser("save", help="snapshot files")
+    save_parser.add_argument("paths", nargs="+")
+    save_parser.add_argument("--label", default="manual")
+
+    list_parser = subparsers.add_parser("list", help="list snapshots")
+    list_parser.add_argument("--path", help="only snapshots containing this file")
+
+    restore_parser = subparsers.add_parser("restore", help="restore files from a snapshot")
+    restore_parser.add_argument("snapshot_id")
+    restore_parser.add_argument("paths", nargs="*", help="files to restore (default: all in the snapshot)")
+    restore_parser.add_argument("--output-dir", help="restore under this directory instead of in place")
+
+    subparsers.add_parser("stats", help="show stored versus logical size")
+
+    import_parser = subparsers.add_parser("import-backups", help="move *_backup.json files into the store")
+    import_parser.add_argument("--names-dir", default=NAMES_DIR)
+    import_parser.add_argument("--delete", action="store_true", help="delete the backup files once imported")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    if args.command == "save":
+        record = store.snapshot(args.paths, args.label)
+        print(f"[OK] Snapshot {record['id']} saved with {len(record['files'])} files")
+    elif args.command == "list":
+        records = store.snapshots(args.path)
+        if not records:
+            print("No snapshots")
+        for record in records:
+            print(f"{record['id']}  {record['created'][:19]}  {record['label']}")
+            for key in record["files"]:
+                print(f"    {key}")
+    elif args.command == "restore":
+        try:
+            restored = store.restore(args.snapshot_id, args.paths or None, args.output_dir)
+        except (KeyError, ValueError) as e:
+            print(f"[ERROR] {e.args[0]}")
+            return
+        for path in restored:
+            print(f"Restored {path}")
+        print(f"[OK] Restored {len(restored)} files")
+    elif args.command == "stats":
+        count, stored, logical = store.stats()
+        ratio = f" ({stored / logical:.1%})" if logical else ""
+        print(f"{count} objects, {stored} bytes stored for {logical} bytes of snapshotted files{ratio}")
+    elif args.command == "import-backups":
+        imported = import_backups(store, args.names_dir, args.delete)
+        print(f"[OK] Imported {len(imported)} backups")
+
+
+if __name__ == "__main__":
+    main()
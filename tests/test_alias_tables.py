@@ -0,0 +1,93 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from alias_tables import AliasTable, build_alias_tables, load_alias_tables, write_alias_tables
+from name_pool import NamePool
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_probabilities_match_weights(seed):
+    rng = np.random.default_rng(seed)
+    weights = rng.exponential(size=rng.integers(1, 500))
+    weights[rng.random(len(weights)) < 0.2] = 0.0
+    if not weights.sum():
+        weights[0] = 1.0
+    table = AliasTable.from_weights(weights)
+
+    assert np.allclose(table.probabilities(), weights / weights.sum())
+    assert ((table.probability >= 0) & (table.probability <= 1 + 1e-12)).all()
+
+
+def test_single_and_uniform_weights():
+    assert AliasTable.from_weights([3.0]).probabilities().tolist() == [1.0]
+    assert np.allclose(AliasTable.from_weights([2.0] * 7).probabilities(), 1 / 7)
+
+
+def test_sample_frequencies_follow_weights():
+    weights = np.array([1.0, 0.0, 5.0, 2.0, 12.0])
+    table = AliasTable.from_weights(weights)
+    draws = table.sample(np.random.default_rng(0), 400_000)
+
+    frequencies = np.bincount(draws, minlength=len(weights)) / len(draws)
+    assert frequencies[1] == 0
+    assert np.abs(frequencies - weights / weights.sum()).max() < 0.005
+
+
+def test_draw_frequencies_follow_weights():
+    weights = [4.0, 1.0, 0.0, 3.0]
+    table = AliasTable.from_weights(weights)
+    rng = random.Random(0)
+    counts = [0] * len(weights)
+    for _ in range(100_000):
+        counts[table.draw(rng)] += 1
+
+    assert counts[2] == 0
+    assert max(abs(count / 100_000 - weight / 8.0) for count, weight in zip(counts, weights)) < 0.01
+
+
+@pytest.mark.parametrize("weights", [[], [0.0, 0.0], [1.0, -1.0, 2.0]])
+def test_invalid_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        AliasTable.from_weights(weights)
+
+
+def test_json_round_trip():
+    table = AliasTable.from_weights([0.5, 3.0, 1.5, 0.0])
+    loaded = AliasTable.from_json(json.loads(json.dumps(table.to_json())))
+    assert np.array_equal(loaded.probabilities(), table.probabilities())
+
+
+@pytest.fixture
+def asset_dirs(tmp_path):
+    names_dir = tmp_path / "names"
+    weights_dir = tmp_path / "weights"
+    names_dir.mkdir()
+    weights_dir.mkdir()
+    data = {"region": "oceania", "gender": "male", "firstNames": ["Ari", "Ben", "Cody"], "lastNames": ["Hill", "Ngata"]}
+    (names_dir / "oceania_male.json").write_text(json.dumps(data), encoding="utf-8")
+    (weights_dir / "oceania_male.json").write_text(json.dumps({"firstNames": {"Ari": 6.0, "Cody": 0.0}}),
+                                                   encoding="utf-8")
+    return names_dir, weights_dir, tmp_path / "alias_tables.json"
+
+
+def test_built_tables_load_for_their_pool(asset_dirs):
+    names_dir, weights_dir, tables_path = asset_dirs
+    write_alias_tables(str(names_dir), str(weights_dir), str(tables_path))
+    pool = NamePool.load("oceania", "male", str(names_dir))
+    first_table, last_table = load_alias_tables(pool, str(tables_path))
+
+    assert last_table is None
+    # Names without a weight count 1.0
+    assert np.allclose(first_table.probabilities(), [6 / 7, 1 / 7, 0.0])
+
+
+def test_stale_tables_are_rejected(asset_dirs):
+    names_dir, weights_dir, tables_path = asset_dirs
+    tables_path.write_text(json.dumps(build_alias_tables(str(names_dir), str(weights_dir))), encoding="utf-8")
+    pool = NamePool(["Ari", "Ben", "Cody", "Dane"], ["Hill", "Ngata"], "oceania", "male")
+
+    with pytest.raises(ValueError, match="stale"):
+        load_alias_tables(pool, str(tables_path))
@@ -0,0 +1,123 @@
+import json
+import os
+
+import pytest
+
+import build_assets
+from build_assets import build_name_assets
+
+
+@pytest.fixture
+def build(tmp_path):
+    output_dir = tmp_path / "names"
+    manifest_path = tmp_path / "manifest.json"
+
+    def run(force=False, jobs=1):
+        return build_name_assets(str(output_dir), str(manifest_path), force, jobs)
+
+    run.output_dir = output_dir
+    run.manifest_path = manifest_path
+    return run
+
+
+def mtimes(directory):
+    return {path.name: path.stat().st_mtime_ns for path in directory.iterdir()}
+
+
+def manifest_files(build):
+    with open(build.manifest_path, encoding="utf-8") as f:
+        return json.load(f)["files"]
+
+
+def statuses(results):
+    return {result["file"]: result["status"] for result in results}
+
+
+def test_second_build_is_a_no_op(build):
+    first = build()
+    assert set(statuses(first).values()) == {"built"}
+    before = mtimes(build.output_dir)
+
+    second = build()
+    assert set(statuses(second).values()) == {"unchanged"}
+    assert mtimes(build.output_dir) == before
+
+
+def test_touched_file_is_not_rebuilt_and_not_rehashed_again(build, monkeypatch):
+    build()
+    path = build.output_dir / "oceania_male.json"
+    content = path.read_bytes()
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    assert statuses(build())["oceania_male.json"] == "unchanged"
+    assert path.read_bytes() == content
+    assert manifest_files(build)["oceania_male.json"]["mtime_ns"] == path.stat().st_mtime_ns
+
+    hashed = []
+    real_hash = build_assets.content_hash
+
+    def spy(data):
+        # Output files are hashed as bytes, input payloads as strings
+        if isinstance(data, bytes):
+            hashed.append(data)
+        return real_hash(data)
+    monkeypatch.setattr(build_assets, "content_hash", spy)
+    assert set(statuses(build()).values()) == {"unchanged"}
+    assert hashed == []
+
+
+def test_edited_file_is_rebuilt(build):
+    build()
+    path = build.output_dir / "oceania_male.json"
+    content = path.read_bytes()
+    path.write_bytes(content.replace(b'"firstNames"', b'"firstNamez"'))
+
+    results = statuses(build())
+    assert results["oceania_male.json"] == "built"
+    assert list(results.values()).count("built") == 1
+    assert path.read_bytes() == content
+
+
+def test_deleted_file_is_rebuilt(build):
+    build()
+    path = build.output_dir / "oceania_male.json"
+    content = path.read_bytes()
+    path.unlink()
+
+    assert statuses(build())["oceania_male.json"] == "built"
+    assert path.read_bytes() == content
+
+
+def test_force_regenerates_every_file(build):
+    build()
+    before = mtimes(build.output_dir)
+
+    results = build(force=True)
+    # Every file is regenerated, but identical output is not rewritten
+    assert all(result["first_names"] is not None for result in results)
+    assert set(statuses(results).values()) == {"unchanged"}
+    assert mtimes(build.output_dir) == before
+
+
+def test_parallel_build_matches_serial_build(tmp_path):
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial = build_name_assets(str(serial_dir), str(tmp_path / "serial.json"), jobs=1)
+    parallel = build_name_assets(str(parallel_dir), str(tmp_path / "parallel.json"), jobs=2)
+
+    assert [result["file"] for result in parallel] == [result["file"] for result in serial]
+    assert {path.name: path.read_bytes() for path in parallel_dir.iterdir()} == \
+        {path.name: path.read_bytes() for path in serial_dir.iterdir()}
+
+    def hashes(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            files = json.load(f)["files"]
+        return {name: (entry["input"], entry["output"], entry["size"]) for name, entry in files.items()}
+    assert hashes(tmp_path / "parallel.json") == hashes(tmp_path / "serial.json")
+
+
+def test_negative_jobs_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="must not be negative"):
+        build_name_assets(str(tmp_path / "names"), str(tmp_path / "manifest.json"), jobs=-1)
+    assert not (tmp_path / "names").exists()
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from name_pool_binary import HEADER, BinaryNamePool, encode_pool
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyzÀÉÎÕÜßçøåæ'- 李王김박ابن"
+
+
+def random_names(rng, count):
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+def write_pool(tmp_path, region, gender, first_names, last_names):
+    path = tmp_path / "pool.s4np"
+    path.write_bytes(encode_pool(region, gender, first_names, last_names))
+    return path
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_round_trip(tmp_path, seed):
+    rng = random.Random(seed)
+    first_names = random_names(rng, rng.randint(0, 300))
+    last_names = random_names(rng, rng.randint(0, 300))
+    path = write_pool(tmp_path, "southAsian", "female", first_names, last_names)
+
+    with BinaryNamePool(path, verify=True) as pool:
+        assert (pool.region, pool.gender) == ("southAsian", "female")
+        assert pool.first_names() == first_names
+        assert pool.last_names() == last_names
+        if first_names:
+            assert pool.first_name(-1) == first_names[-1]
+
+
+def test_index_out_of_range(tmp_path):
+    path = write_pool(tmp_path, "english", "male", ["Al"], ["Bo", "Cy"])
+    with BinaryNamePool(path) as pool:
+        with pytest.raises(IndexError):
+            pool.first_name(1)
+        with pytest.raises(IndexError):
+            pool.last_name(-3)
+
+
+def test_corrupt_body_fails_verification(tmp_path):
+    path = write_pool(tmp_path, "english", "male", ["Alan", "Bert"], ["Cole"])
+    blob = bytearray(path.read_bytes())
+    blob[-1] ^= 0xFF
+    path.write_bytes(bytes(blob))
+
+    with pytest.raises(ValueError, match="Checksum"):
+        BinaryNamePool(path, verify=True)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = write_pool(tmp_path, "english", "male", ["Alan", "Bert"], ["Cole"])
+    path.write_bytes(path.read_bytes()[:-2])
+
+    with pytest.raises(ValueError, match="Truncated"):
+        BinaryNamePool(path)
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    path = tmp_path / "pool.s4np"
+    path.write_bytes(b"NOPE" + bytes(HEADER.size))
+
+    with pytest.raises(ValueError, match="not a binary name pool"):
+        BinaryNamePool(path)
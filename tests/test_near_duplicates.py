@@ -0,0 +1,99 @@
+import random
+
+import numpy as np
+import pytest
+
+from near_duplicates import (
+    MinHasher,
+    bigrams,
+    encode_names,
+    find_near_duplicates,
+    levenshtein_batch,
+    lsh_candidates,
+)
+
+ALPHABET = "abcdeéöü李"
+
+
+def reference_levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def similarity(a, b):
+    return 1.0 - reference_levenshtein(a, b) / max(len(a), len(b))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_levenshtein_batch_matches_reference(seed):
+    rng = random.Random(seed)
+    names = ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 14))) for _ in range(60)]
+    left = np.array([rng.randrange(len(names)) for _ in range(500)])
+    right = np.array([rng.randrange(len(names)) for _ in range(500)])
+
+    codes, lengths = encode_names(names)
+    distances = levenshtein_batch(codes, lengths, left, right)
+
+    expected = [reference_levenshtein(names[i], names[j]) for i, j in zip(left, right)]
+    assert distances.tolist() == expected
+
+
+def test_levenshtein_batch_known_distances():
+    names = ["kitten", "sitting", "", "Hasan", "Hassan", "flaw", "lawn"]
+    codes, lengths = encode_names(names)
+    distances = levenshtein_batch(codes, lengths, np.array([0, 2, 3, 5, 1]), np.array([1, 0, 4, 6, 1]))
+    assert distances.tolist() == [3, 6, 1, 2, 0]
+
+
+def test_minhash_estimates_jaccard():
+    a, b = "Alexandria", "Alexandrina"
+    signatures = MinHasher(num_hashes=1024, seed=3).signatures([a, b])
+    estimate = np.mean(signatures[0] == signatures[1])
+    exact = len(bigrams(a) & bigrams(b)) / len(bigrams(a) | bigrams(b))
+    assert abs(estimate - exact) < 0.08
+
+
+def test_lsh_candidates_are_unique_ordered_pairs():
+    names = ["Mansur", "Mansoor", "Mansur", "Yusuf", "Yusef", "Zed"]
+    signatures = MinHasher(num_hashes=128, seed=0).signatures(names)
+    pairs = lsh_candidates(signatures, bands=32, rows=4)
+
+    assert (pairs[:, 0] < pairs[:, 1]).all()
+    assert len({tuple(pair) for pair in pairs.tolist()}) == len(pairs)
+    # Identical signatures share every band
+    assert [0, 2] in pairs.tolist()
+
+
+def test_find_near_duplicates_groups_variants_only():
+    names = ["Hasan", "Hassan", "Yusuf", "Yusef", "Mansur", "Mansoor", "Katherine", "Katharine",
+             "Oliver", "Priyanka", "Tomasz", "Zhang"]
+    groups = find_near_duplicates(names)
+
+    assert ["Hasan", "Hassan"] in groups
+    assert ["Katharine", "Katherine"] in groups
+    grouped = {name for group in groups for name in group}
+    assert not grouped & {"Oliver", "Priyanka", "Tomasz", "Zhang"}
+
+
+def test_find_near_duplicates_only_groups_similar_names():
+    rng = random.Random(1)
+    names = sorted({"".join(rng.choice("aeiklmnorst") for _ in range(rng.randint(4, 9))) for _ in range(400)})
+    for group in find_near_duplicates(names, threshold=0.7):
+        # Every member is linked to some other member by a verified pair
+        for name in group:
+            assert any(similarity(name, other) >= 0.7 - 1e-9 for other in group if other != name)
+
+
+def test_find_near_duplicates_recalls_single_edits():
+    rng = random.Random(2)
+    bases = sorted({"".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(10)) for _ in range(200)})
+    variants = [base[:5] + ("x" if base[5] != "x" else "y") + base[6:] for base in bases]
+    groups = find_near_duplicates(bases + variants, threshold=0.8)
+
+    found = sum(1 for base, variant in zip(bases, variants) if sorted([base, variant]) in groups)
+    assert found >= 0.95 * len(bases)
@@ -0,0 +1,81 @@
+import argparse
+import hashlib
+import io
+import json
+
+import numpy as np
+import pytest
+
+from name_pool import NamePool
+from sims4names import NameStream, generate
+from splittable_rng import BLOCK_SIZE, block_generator, iter_blocks
+
+COUNT = 2 * BLOCK_SIZE + 1234
+
+
+@pytest.fixture
+def names_dir(tmp_path):
+    names_dir = tmp_path / "names"
+    names_dir.mkdir()
+    data = {
+        "region": "english",
+        "gender": "female",
+        "firstNames": [f"First{i}" for i in range(50)] + ["Zoë", 'Quote"d'],
+        "lastNames": [f"Last{i}" for i in range(70)] + ["O'Neil, Jr"]
+    }
+    (names_dir / "english_female.json").write_text(json.dumps(data), encoding="utf-8")
+    (tmp_path / "weights.json").write_text(json.dumps({"firstNames": {"First0": 40.0, "Zoë": 0.0}}),
+                                           encoding="utf-8")
+    return names_dir
+
+
+def generate_bytes(names_dir, workers, output_format="ndjson", weights=None, seed=42):
+    args = argparse.Namespace(
+        region="english", gender="female", count=COUNT, format=output_format, traits=None,
+        weights=weights, weighted=False, alias_tables=None, names_dir=str(names_dir),
+        combinations=None, traits_file=None, workers=workers
+    )
+    out = io.BytesIO()
+    generate(args, out, seed)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "csv"])
+def test_output_is_identical_for_any_worker_count(names_dir, output_format):
+    digests = {workers: hashlib.sha256(generate_bytes(names_dir, workers, output_format)).hexdigest()
+               for workers in (1, 2, 3)}
+    assert len(set(digests.values())) == 1
+
+
+def test_weighted_output_is_identical_for_any_worker_count(names_dir):
+    weights = str(names_dir.parent / "weights.json")
+    serial = generate_bytes(names_dir, 1, weights=weights)
+    assert generate_bytes(names_dir, 3, weights=weights) == serial
+    assert "Zoë" not in serial.decode("utf-8")
+
+
+def test_output_depends_on_seed(names_dir):
+    assert generate_bytes(names_dir, 1, seed=1) != generate_bytes(names_dir, 1, seed=2)
+
+
+def test_blocks_render_independently(names_dir):
+    stream = NameStream(NamePool.load("english", "female", str(names_dir)))
+    whole = "".join(stream.chunks(COUNT, 7))
+    blocks = [stream.render(7, block, size) for block, size in iter_blocks(COUNT)]
+    assert "".join(blocks) == whole
+    assert whole.count("\n") == COUNT
+    # The last block can be regenerated on its own
+    last_block, last_size = list(iter_blocks(COUNT))[-1]
+    assert whole.endswith(stream.render(7, last_block, last_size))
+
+
+def test_block_generators_are_the_spawned_children():
+    children = np.random.SeedSequence(99).spawn(4)
+    for block, child in enumerate(children):
+        expected = np.random.Generator(np.random.PCG64(child)).integers(1 << 30, size=8)
+        assert block_generator(99, block).integers(1 << 30, size=8).tolist() == expected.tolist()
+
+
+def test_iter_blocks_covers_count():
+    assert list(iter_blocks(0)) == []
+    assert list(iter_blocks(5, block_size=2)) == [(0, 2), (1, 2), (2, 1)]
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from phonetic_index import PhoneticIndex, fold_name, metaphone, soundex
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Robert", "R163"),
+    ("Rupert", "R163"),
+    ("Rubin", "R150"),
+    ("Ashcraft", "A261"),
+    ("Ashcroft", "A261"),
+    ("Tymczak", "T522"),
+    ("Pfister", "P236"),
+    ("Honeyman", "H555"),
+    ("Lee", "L000"),
+    ("Müller", "M460"),
+    ("", ""),
+])
+def test_soundex(name, key):
+    assert soundex(name) == key
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Knight", "NT"),
+    ("Thomas", "0MS"),
+    ("Philip", "FLP"),
+    ("Wright", "RT"),
+    ("Gnome", "NM"),
+    ("Xavier", "SFR"),
+    ("Michael", "MXL"),
+    ("Dodge", "TJ"),
+    ("Shawn", "XN"),
+    ("Çelik", "SLK"),
+    ("", ""),
+])
+def test_metaphone(name, key):
+    assert metaphone(name) == key
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Mahmud", "Mahmoud"),
+    ("Yaqoob", "Yakub"),
+    ("Philip", "Filip"),
+    ("Catherine", "Kathryn"),
+    ("Müller", "Mueller"),
+])
+def test_metaphone_matches_spelling_variants(a, b):
+    assert metaphone(a) == metaphone(b)
+
+
+def test_fold_name_keeps_ascii_letters():
+    assert fold_name("O'Brien-Núñez") == "OBRIENNUNEZ"
+
+
+def write_name_file(names_dir, region, gender, first_names, last_names):
+    data = {"region": region, "gender": gender, "firstNames": first_names, "lastNames": last_names}
+    (names_dir / f"{region}_{gender}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def names_dir(tmp_path):
+    names_dir = tmp_path / "names"
+    names_dir.mkdir()
+    write_name_file(names_dir, "middleEastern", "male", ["Mahmud", "Yakub"], ["Haddad"])
+    write_name_file(names_dir, "middleEastern", "female", ["Mahmoud"], ["Hadad"])
+    write_name_file(names_dir, "southAsian", "male", ["Yaqoob", "Arjun"], ["Sharma"])
+    return names_dir
+
+
+def test_sounds_like_by_scope(names_dir):
+    index = PhoneticIndex.build(names_dir)
+
+    assert index.sounds_like("Mahmood") == ["Mahmoud", "Mahmud"]
+    assert index.sounds_like("Yacoub", region="middleEastern") == ["Yakub"]
+    assert index.sounds_like("Yacoub", region="southAsian", gender="male") == ["Yaqoob"]
+    assert index.sounds_like("Yacoub", region="southAsian", gender="female") == []
+    assert index.sounds_like("Robert", algorithm="soundex") == []
+
+
+def test_save_and_load_round_trip(names_dir, tmp_path):
+    index = PhoneticIndex.build(names_dir)
+    index_path = tmp_path / "index" / "phonetic_index.json"
+    index.save(str(index_path))
+    loaded = PhoneticIndex.load(str(index_path))
+
+    assert loaded.names == index.names
+    assert loaded.keys == index.keys
+    assert loaded.file_keys == index.file_keys
+    assert loaded.sounds_like("Haddad", region="middleEastern") == ["Hadad", "Haddad"]
@@ -0,0 +1,50 @@
+from pipeline_profile import MemoryTracker
+
+
+def allocate_small():
+    return [bytes(1000) for _ in range(10)]
+
+
+def allocate_large():
+    return [bytes(100_000) for _ in range(50)]
+
+
+def measure_calls(tracker, stats, functions):
+    # Like the per-file phases, each call's data is released before the next call
+    tracker.start()
+    try:
+        for function in functions:
+            with tracker.measure("phase dedupe", stats):
+                data = function()
+            del data
+    finally:
+        tracker.stop()
+
+
+def top_site(stats):
+    return stats["top_sites"][0]["site"]
+
+
+def test_sites_come_from_the_call_that_set_the_peak():
+    stats = {}
+    measure_calls(MemoryTracker(), stats, [allocate_small, allocate_large, allocate_small])
+
+    assert stats["calls"] == 3
+    assert stats["peak_call"] == 2
+    assert stats["peak_growth_bytes"] >= 50 * 100_000
+    assert top_site(stats).endswith(f":{allocate_large.__code__.co_firstlineno + 1}")
+
+
+def test_first_call_sites_are_kept_when_it_holds_the_peak():
+    stats = {}
+    measure_calls(MemoryTracker(), stats, [allocate_large, allocate_small])
+
+    assert stats["peak_call"] == 1
+    assert top_site(stats).endswith(f":{allocate_large.__code__.co_firstlineno + 1}")
+
+
+def test_no_sites_without_top():
+    stats = {}
+    measure_calls(MemoryTracker(top=0), stats, [allocate_small])
+    assert "top_sites" not in stats
+    assert stats["peak_bytes"] > 0
@@ -0,0 +1,129 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from analyze_duplicates import analyze_and_fix_file, remove_duplicates_from_file
+from snapshot_store import MAX_DELTA_CHAIN, SnapshotStore, _path_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "store"))
+
+
+def name_file_bytes(first_names, last_names):
+    data = {"region": "english", "gender": "male", "firstNames": first_names, "lastNames": last_names}
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def test_put_get_round_trip_across_delta_chains(store):
+    names = [f"Name{i}" for i in range(400)]
+    versions = []
+    for i in range(3 * MAX_DELTA_CHAIN):
+        names = names[:i] + names[i + 1:] + [f"Added{i}"]
+        versions.append(name_file_bytes(names, ["Smith"]))
+
+    digests = []
+    base = None
+    for data in versions:
+        base = store.put(data, base=base)
+        digests.append(base)
+
+    assert [store.get(digest) for digest in digests] == versions
+    assert max(store._chain_length(digest) for digest in digests) == MAX_DELTA_CHAIN
+    # Chains restart with a full copy once they reach the limit
+    assert store._chain_length(digests[MAX_DELTA_CHAIN + 1]) == 0
+
+
+def test_put_is_content_addressed(store):
+    assert store.put(b"same") == store.put(b"same", base=store.put(b"other"))
+    assert store.get(store.put(b"")) == b""
+
+
+def test_snapshots_delta_against_the_previous_version(store, tmp_path):
+    path = tmp_path / "english_male.json"
+    path.write_bytes(name_file_bytes(["Al", "Bo"], ["Cy"]))
+    first = store.snapshot([path], "one")
+    path.write_bytes(name_file_bytes(["Al", "Bo", "Di"], ["Cy"]))
+    second = store.snapshot([path], "two")
+
+    key = _path_key(path)
+    assert store._chain_length(second["files"][key]) == 1
+    # A fresh store reads the same history from the log
+    assert [record["id"] for record in SnapshotStore(store.root).snapshots(path)] == [first["id"], second["id"]]
+
+
+def test_restore_in_place_and_under_output_dir(store, tmp_path):
+    path = tmp_path / "live" / "english_male.json"
+    path.parent.mkdir()
+    original = name_file_bytes(["Al"], ["Cy"])
+    path.write_bytes(original)
+    record = store.snapshot([path])
+    path.write_bytes(b"edited")
+
+    output_dir = tmp_path / "out"
+    restored = store.restore(record["id"], output_dir=str(output_dir))
+    assert path.read_bytes() == b"edited"
+    assert len(restored) == 1
+    assert output_dir in Path(restored[0]).resolve().parents
+    assert Path(restored[0]).read_bytes() == original
+
+    assert store.restore(record["id"], [path]) == [str(path)]
+    assert path.read_bytes() == original
+
+
+def test_restore_keeps_parent_keys_inside_output_dir(store, tmp_path):
+    live = tmp_path / "a.json"
+    live.write_bytes(b"live")
+    digest = store.put(b"old")
+    # Keys recorded relative to the repo root by an earlier version of the store
+    record = store.record({f"../../..{live}": digest}, "legacy")
+
+    output_dir = tmp_path / "out"
+    [target] = store.restore(record["id"], output_dir=str(output_dir))
+    assert live.read_bytes() == b"live"
+    assert output_dir in Path(target).resolve().parents
+
+    escaping = store.record({"..": digest, "ok.json": digest}, "escaping")
+    with pytest.raises(ValueError):
+        store.restore(escaping["id"], output_dir=str(tmp_path / "out2"))
+    assert not (tmp_path / "out2").exists()
+
+
+def test_find_missing_and_ambiguous_ids(store):
+    digest = store.put(b"data")
+    first = store.record({"a.json": digest}, "one", created="2024-01-01T00:00:00+00:00")
+    store.record({"a.json": digest}, "two", created="2024-01-02T00:00:00+00:00")
+
+    assert store.find(first["id"]) == first
+    assert store.find(first["id"][:8]) == first
+    with pytest.raises(KeyError, match="No snapshot"):
+        store.find("not-an-id")
+    with pytest.raises(KeyError, match="ambiguous"):
+        store.find("")
+    with pytest.raises(KeyError, match="does not contain"):
+        store.restore(first["id"], ["b.json"])
+
+
+@pytest.mark.parametrize("clean", [remove_duplicates_from_file, analyze_and_fix_file])
+def test_clean_files_are_not_snapshotted(store, tmp_path, clean):
+    path = tmp_path / "english_male.json"
+    path.write_bytes(name_file_bytes(["Al", "Bo"], ["Cy"]))
+    before = path.stat().st_mtime_ns
+
+    assert clean(str(path), store=store)
+    assert store.snapshots() == []
+    assert path.stat().st_mtime_ns == before
+
+
+@pytest.mark.parametrize("clean", [remove_duplicates_from_file, analyze_and_fix_file])
+def test_cleaned_files_are_snapshotted_first(store, tmp_path, clean):
+    path = tmp_path / "english_male.json"
+    original = name_file_bytes(["Al", "Bo", "Al"], ["Cy"])
+    path.write_bytes(original)
+
+    clean(str(path), store=store)
+    [record] = store.snapshots()
+    assert store.get(record["files"][_path_key(path)]) == original
+    assert json.loads(path.read_bytes())["firstNames"] == ["Al", "Bo"]
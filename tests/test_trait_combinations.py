@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import trait_combinations
+from trait_combinations import TraitCombinationTable, write_combination_table
+
+
+def trait(trait_id, category="emotional", conflicts=()):
+    return {"id": trait_id, "name": trait_id.title(), "category": category, "pack": "base_game",
+            "conflictingTraits": list(conflicts)}
+
+
+TRAITS = [trait("cheerful", conflicts=["gloomy"]), trait("gloomy"), trait("creative", "hobby"),
+          trait("geek", "hobby"), trait("lazy", "lifestyle"), trait("wiggly", "toddler")]
+
+
+@pytest.fixture
+def assets(tmp_path):
+    traits_path = tmp_path / "traits.json"
+    traits_path.write_text(json.dumps({"traits": TRAITS}), encoding="utf-8")
+    table_path = tmp_path / "trait_combinations.json"
+    write_combination_table(TRAITS, str(table_path))
+    return str(table_path), traits_path
+
+
+def test_matching_sidecar_is_loaded(assets, monkeypatch):
+    table_path, traits_path = assets
+
+    def rebuild(traits):
+        raise AssertionError("the up-to-date sidecar should be used")
+    monkeypatch.setattr(trait_combinations, "build_combination_table", rebuild)
+
+    table = TraitCombinationTable.from_assets(table_path, str(traits_path))
+    # 5 child-and-up traits, minus the cheerful/gloomy conflict
+    assert table.count("adult") == 10 - 3
+    assert table.count("toddler") == 1
+
+
+def test_stale_sidecar_is_rebuilt(assets):
+    table_path, traits_path = assets
+    traits_path.write_text(json.dumps({"traits": TRAITS + [trait("squeamish")]}), encoding="utf-8")
+
+    table = TraitCombinationTable.from_assets(table_path, str(traits_path))
+    assert "squeamish" in table.ids
+    assert table.count("adult") == 20 - 4
+
+
+def test_sidecar_without_traits_hash_is_rebuilt(assets):
+    table_path, traits_path = assets
+    with open(table_path, encoding="utf-8") as f:
+        data = json.load(f)
+    del data["traitsHash"]
+    data["stages"]["adult"]["count"] = 0
+    with open(table_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    assert TraitCombinationTable.from_assets(table_path, str(traits_path)).count("adult") == 7
+
+
+def test_sidecar_is_used_without_traits_file(assets, tmp_path):
+    table_path, _ = assets
+    table = TraitCombinationTable.from_assets(table_path, str(tmp_path / "missing.json"))
+    assert table.count("adult") == 7
+
+
+def test_unrank_and_rank_agree(assets):
+    table_path, traits_path = assets
+    table = TraitCombinationTable.from_assets(table_path, str(traits_path))
+    for rank in range(table.count("adult")):
+        trait_ids = table.unrank("adult", rank)
+        assert not {"cheerful", "gloomy"} <= set(trait_ids)
+        assert table.rank("adult", trait_ids) == rank
@@ -0,0 +1,46 @@
+import pytest
+
+from name_pool import NamePool
+from unique_names import FeistelPermutation, PoolExhaustedError, UniqueNameSampler
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 7, 16, 17, 100, 255, 256, 257, 1000, 4099, 70001])
+@pytest.mark.parametrize("key", [0, 1, 987654321])
+def test_feistel_is_a_bijection(size, key):
+    permutation = FeistelPermutation(size, key)
+    assert sorted(permutation(index) for index in range(size)) == list(range(size))
+
+
+def test_feistel_depends_on_key():
+    orders = {tuple(FeistelPermutation(1000, key)(index) for index in range(1000)) for key in range(5)}
+    assert len(orders) == 5
+
+
+def test_feistel_is_deterministic():
+    first = FeistelPermutation(5000, 42)
+    second = FeistelPermutation(5000, 42)
+    assert all(first(index) == second(index) for index in range(5000))
+
+
+def test_feistel_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        FeistelPermutation(0, 1)
+    permutation = FeistelPermutation(10, 1)
+    with pytest.raises(IndexError):
+        permutation(10)
+    with pytest.raises(IndexError):
+        permutation(-1)
+
+
+def test_sampler_draws_every_pair_once_and_resumes():
+    pool = NamePool(["Ann", "Bea", "Cat"], ["Dale", "Eton", "Ford", "Gray"], "english", "female")
+    sampler = UniqueNameSampler(pool, key=7)
+    head = sampler.draw_many(5)
+
+    resumed = UniqueNameSampler.from_state(pool, sampler.state())
+    pairs = head + list(resumed)
+
+    assert len(pairs) == len(pool) == 12
+    assert len(set(pairs)) == 12
+    with pytest.raises(PoolExhaustedError):
+        resumed.draw()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Exhaustive table of valid trait combinations per life stage.
+
+A life stage allows AgeBasedLimits.traitLimits traits, drawn from infant
+traits for infants, toddler traits for toddlers and every other category from
+child up. Every conflict-free set of exactly that many traits is enumerated
+with bitset pruning and stored in lexicographic order, so any valid set can
+be unranked (and therefore drawn uniformly) in O(1) with no rejection loop.
+"""
+
+import argparse
+import json
+import os
+import random
+
+from asset_io import INDEX_DIR, content_hash, load_json, write_json
+from trait_index import TRAITS_PATH, TraitIndex
+
+COMBINATIONS_PATH = os.path.join(INDEX_DIR, "trait_combinations.json")
+COMBINATIONS_VERSION = 2
+
+# Mirrors LifeStage and AgeBasedLimits.traitLimits in lib/models/enums.dart
+LIFE_STAGES = ["infant", "toddler", "child", "teen", "youngAdult", "adult", "elder"]
+TRAIT_LIMITS = {
+    "infant": 1,
+    "toddler": 1,
+    "child": 1,
+    "teen": 2,
+    "youngAdult": 3,
+    "adult": 3,
+    "elder": 3,
+}
+STAGE_CATEGORIES = {"infant": {"infant"}, "toddler": {"toddler"}}
+YOUNG_CATEGORIES = {"infant", "toddler"}
+
+
+def is_trait_for_stage(trait, stage):
+    """Check whether a trait can be held at a life stage.
+
+    Explicit allowedLifeStages/minimumAge/maximumAge follow
+    Trait.isAppropriateForLifeStage; otherwise the category decides.
+    """
+    allowed = trait.get("allowedLifeStages") or []
+    if allowed:
+        return stage in allowed
+    stage_index = LIFE_STAGES.index(stage)
+    if trait.get("minimumAge") and stage_index < LIFE_STAGES.index(trait["minimumAge"]):
+        return False
+    if trait.get("maximumAge") and stage_index > LIFE_STAGES.index(trait["maximumAge"]):
+        return False
+    if stage in STAGE_CATEGORIES:
+        return trait["category"] in STAGE_CATEGORIES[stage]
+    return trait["category"] not in YOUNG_CATEGORIES
+
+
+def stage_mask(traits, stage):
+    """Return the bitset of trait entries available at a life stage."""
+    mask = 0
+    for position, trait in enumerate(traits):
+        if is_trait_for_stage(trait, stage):
+            mask |= 1 << position
+    return mask
+
+
+def _exclusion_masks(index):
+    """Per entry, the entries it can't be combined with: conflicts plus same-ID entries."""
+    return [
+        conflicts | index.id_masks[trait_id]
+        for conflicts, trait_id in zip(index.conflicts, index.ids)
+    ]
+
+
+def count_combinations(index, candidates, size):
+    """Count conflict-free sets of exactly size entries drawn from candidates."""
+    exclusions = _exclusion_masks(index)
+
+    def count(available, remaining):
+        if remaining == 1:
+            return bin(available).count("1")
+        total = 0
+        while available:
+            low_bit = available & -available
+            available ^= low_bit
+            position = low_bit.bit_length() - 1
+            # Only higher positions remain in available, so each set is counted once
+            rest = available & ~exclusions[position]
+            if rest:
+                total += count(rest, remaining - 1)
+        return total
+
+    if size == 0:
+        return 1
+    return count(candidates, size)
+
+
+def enumerate_combinations(index, candidates, size):
+    """Yield every conflict-free set of exactly size entries, in lexicographic order."""
+    exclusions = _exclusion_masks(index)
+
+    def walk(available, prefix, remaining):
+        while available:
+            low_bit = available & -available
+            available ^= low_bit
+            position = low_bit.bit_length() - 1
+            if remaining == 1:
+                yield prefix + (position,)
+            else:
+                rest = available & ~exclusions[position]
+                if rest:
+                    yield from walk(rest, prefix + (position,), remaining - 1)
+
+    if size == 0:
+        yield ()
+        return
+    yield from walk(candidates, (), size)
+
+
+def traits_hash(traits):
+    """Hash a traits list, to tell whether a combination table was built from it."""
+    return content_hash(json.dumps(traits, ensure_ascii=False, sort_keys=True, separators=(",", ":")))
+
+
+def build_combination_table(traits):
+    """Build the per-stage combination tables for a list of trait dictionaries."""
+    index = TraitIndex.from_traits(traits)
+    stages = {}
+    built = {}
+    for stage in LIFE_STAGES:
+        limit = TRAIT_LIMITS[stage]
+        candidates = stage_mask(traits, stage)
+        table = {"limit": limit, "candidates": bin(candidates).count("1")}
+
+        # Young adults, adults and elders share one table instead of three copies
+        same_as = built.get((limit, candidates))
+        if same_as:
+            table["count"] = stages[same_as]["count"]
+            table["sameAs"] = same_as
+        else:
+            flat = []
+            for combination in enumerate_combinations(index, candidates, limit):
+                flat.extend(combination)
+            table["count"] = len(flat) // limit if limit else 1
+            # Positions of each set, concatenated with a stride of limit
+            table["combinations"] = flat
+            built[(limit, candidates)] = stage
+        stages[stage] = table
+    return {"version": COMBINATIONS_VERSION, "traitsHash": traits_hash(traits), "ids": index.ids, "stages": stages}
+
+
+def write_combination_table(traits, table_path=COMBINATIONS_PATH):
+    """Build and write the combination table sidecar; returns the table data."""
+    data = build_combination_table(traits)
+    os.makedirs(os.path.dirname(table_path), exist_ok=True)
+    write_json(table_path, data, compact=True)
+    return data
+
+
+class TraitCombinationTable:
+    """Rank, unrank and uniform sampling over valid trait sets per life stage."""
+
+    def __init__(self, data):
+        if data.get("version") != COMBINATIONS_VERSION:
+            raise ValueError("Unsupported trait combination table version")
+        self.ids = data["ids"]
+        self.stages = data["stages"]
+        for table in self.stages.values():
+            if "sameAs" in table:
+                table["combinations"] = self.stages[table["sameAs"]]["combinations"]
+        self._ranks = {}
+
+    @classmethod
+    def load(cls, table_path=COMBINATIONS_PATH):
+        """Load the sidecar written by generate_trait_sidecars()."""
+        return cls(load_json(table_path))
+
+    @classmethod
+    def from_traits_file(cls, traits_path=TRAITS_PATH):
+        """Build the table in memory from a traits.json file."""
+        return cls(build_combination_table(load_json(traits_path)["traits"]))
+
+    @classmethod
+    def from_assets(cls, table_path=COMBINATIONS_PATH, traits_path=TRAITS_PATH):
+        """Load the sidecar if it was built from traits.json, otherwise build the table from traits.json.
+
+        Without traits.json the sidecar is used as it is.
+        """
+        if not os.path.exists(traits_path):
+            return cls.load(table_path)
+        traits = load_json(traits_path)["traits"]
+        if os.path.exists(table_path):
+            data = load_json(table_path)
+            if data.get("version") == COMBINATIONS_VERSION and data.get("traitsHash") == traits_hash(traits):
+                return cls(data)
+        return cls(build_combination_table(traits))
+
+    def count(self, stage):
+        """Return how many valid trait sets a life stage has."""
+        return self.stages[stage]["count"]
+
+    def unrank(self, stage, rank):
+        """Return the trait IDs of the valid set with the given rank."""
+        table = self.stages[stage]
+        if not 0 <= rank < table["count"]:
+            raise IndexError(f"Rank {rank} is outside {stage}'s {table['count']} combinations")
+        limit = table["limit"]
+        positions = table["combinations"][rank * limit:(rank + 1) * limit]
+        return [self.ids[position] for position in positions]
+
+    def rank(self, stage, trait_ids):
+        """Return the rank of a valid trait set, or raise KeyError if it is not valid."""
+        if stage not in self._ranks:
+            table = self.stages[stage]
+            limit = table["limit"]
+            flat = table["combinations"]
+            self._ranks[stage] = {
+                frozenset(self.ids[position] for position in flat[start:start + limit]): start // limit
+                for start in range(0, len(flat), limit)
+            }
+        return self._ranks[stage][frozenset(trait_ids)]
+
+    def draw(self, stage, rng=random):
+        """Draw a valid trait set for a life stage uniformly at random."""
+        return self.unrank(stage, rng.randrange(self.count(stage)))
+
+
+def report(data):
+    """Print combination counts per life stage."""
+    print(f"{'life stage':<12}{'limit':>6}{'traits':>8}{'valid sets':>12}")
+    for stage in LIFE_STAGES:
+        table = data["stages"][stage]
+        print(f"{stage:<12}{table['limit']:>6}{table['candidates']:>8}{table['count']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and sample the valid trait combination tables.")
+    parser.add_argument("--traits", default=TRAITS_PATH, help="traits.json to enumerate")
+    parser.add_argument("--output", default=COMBINATIONS_PATH, help="path of the combination table sidecar")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="enumerate, write and report the tables")
+    subparsers.add_parser("count", help="report counts without writing the tables")
+    draw_parser = subparsers.add_parser("draw", help="draw uniform trait sets from the written tables")
+    draw_parser.add_argument("--stage", default="adult", choices=LIFE_STAGES)
+    draw_parser.add_argument("--count", type=int, default=5)
+    draw_parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        data = write_combination_table(load_json(args.traits)["traits"], args.output)
+        report(data)
+        print(f"\n[OK] Wrote {args.output}")
+    elif args.command == "count":
+        traits = load_json(args.traits)["traits"]
+        index = TraitIndex.from_traits(traits)
+        print(f"{'life stage':<12}{'limit':>6}{'valid sets':>12}")
+        for stage in LIFE_STAGES:
+            total = count_combinations(index, stage_mask(traits, stage), TRAIT_LIMITS[stage])
+            print(f"{stage:<12}{TRAIT_LIMITS[stage]:>6}{total:>12}")
+    elif args.command == "draw":
+        table = TraitCombinationTable.load(args.output)
+        rng = random.Random(args.seed)
+        for _ in range(args.count):
+            print(", ".join(table.draw(args.stage, rng)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Bitmask index over the Sims 4 traits database.
+
+Every trait gets a dense integer ID (its position in the traits list). Each
+trait's conflicts are stored as a symmetric bitset, and every category and
+pack has a membership mask, so compatibility checks become bitwise ANDs
+instead of pairwise scans over conflictingTraits lists.
+"""
+
+import argparse
+import os
+
+from asset_io import INDEX_DIR, TRAITS_DIR, load_json, write_json
+
+TRAITS_PATH = os.path.join(TRAITS_DIR, "traits.json")
+TRAIT_INDEX_PATH = os.path.join(INDEX_DIR, "traits_index.json")
+TRAIT_INDEX_VERSION = 1
+
+
+def _to_hex(mask):
+    # Hex strings keep masks wider than 53 bits intact for JSON readers
+    return format(mask, "x")
+
+
+def _id_masks(ids):
+    """Map each trait ID to the bitset of the entries that carry it."""
+    masks = {}
+    for position, trait_id in enumerate(ids):
+        masks[trait_id] = masks.get(trait_id, 0) | (1 << position)
+    return masks
+
+
+def build_trait_index(traits):
+    """Build the serializable bitmask index for a list of trait dictionaries.
+
+    Some IDs appear more than once (e.g. "clumsy" as a lifestyle and a toddler
+    trait). Each entry keeps its own dense ID and conflicts are resolved by
+    trait ID like TraitRepository does, so a conflict with "clumsy" covers
+    both entries.
+    """
+    ids = [trait["id"] for trait in traits]
+    id_masks = _id_masks(ids)
+
+    conflicts = [0] * len(ids)
+    unknown = set()
+    for position, trait in enumerate(traits):
+        for other_id in trait.get("conflictingTraits", []):
+            other_mask = id_masks.get(other_id)
+            if other_mask is None:
+                unknown.add(other_id)
+                continue
+            conflicts[position] |= other_mask
+            for other, other_trait_id in enumerate(ids):
+                if other_trait_id == other_id:
+                    conflicts[other] |= 1 << position
+
+    categories = {}
+    packs = {}
+    for position, trait in enumerate(traits):
+        categories[trait["category"]] = categories.get(trait["category"], 0) | (1 << position)
+        packs[trait["pack"]] = packs.get(trait["pack"], 0) | (1 << position)
+
+    return {
+        "version": TRAIT_INDEX_VERSION,
+        "ids": ids,
+        "conflicts": [_to_hex(mask) for mask in conflicts],
+        "categories": {name: _to_hex(mask) for name, mask in categories.items()},
+        "packs": {name: _to_hex(mask) for name, mask in packs.items()},
+        "unknownConflicts": sorted(unknown)
+    }
+
+
+def write_trait_index(traits, index_path=TRAIT_INDEX_PATH):
+    """Build and write the trait index sidecar; returns the index data."""
+    data = build_trait_index(traits)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    write_json(index_path, data)
+    return data
+
+
+class TraitIndex:
+    """Compatibility queries over trait bitsets."""
+
+    def __init__(self, data):
+        if data.get("version") != TRAIT_INDEX_VERSION:
+            raise ValueError("Unsupported trait index version")
+        self.ids = data["ids"]
+        self.id_masks = _id_masks(self.ids)
+        self.conflicts = [int(mask, 16) for mask in data["conflicts"]]
+        self.categories = {name: int(mask, 16) for name, mask in data["categories"].items()}
+        self.packs = {name: int(mask, 16) for name, mask in data["packs"].items()}
+        self.all_mask = (1 << len(self.ids)) - 1
+
+    @classmethod
+    def load(cls, index_path=TRAIT_INDEX_PATH):
+        """Load the sidecar written by generate_trait_sidecars()."""
+        return cls(load_json(index_path))
+
+    @classmethod
+    def from_traits(cls, traits):
+        """Build an index in memory from trait dictionaries."""
+        return cls(build_trait_index(traits))
+
+    @classmethod
+    def from_traits_file(cls, traits_path=TRAITS_PATH):
+        """Build an index in memory from a traits.json file."""
+        return cls.from_traits(load_json(traits_path)["traits"])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask_of(self, trait_ids):
+        """Return the bitset of every entry carrying one of the trait IDs."""
+        mask = 0
+        for trait_id in trait_ids:
+            mask |= self.id_masks[trait_id]
+        return mask
+
+    def ids_of(self, mask):
+        """Return the trait IDs set in a bitset, in dense ID order."""
+        ids = []
+        while mask:
+            low_bit = mask & -mask
+            ids.append(self.ids[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return list(dict.fromkeys(ids))
+
+    def conflict_mask(self, mask):
+        """Return the union of the conflicts of every trait in mask."""
+        result = 0
+        while mask:
+            low_bit = mask & -mask
+            result |= self.conflicts[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return result
+
+    def conflicts_with(self, trait_id, other_id):
+        """Check whether two traits conflict."""
+        return bool(self.conflict_mask(self.id_masks[trait_id]) & self.id_masks[other_id])
+
+    def conflicts_with_any(self, trait_id, trait_ids):
+        """Check whether a trait conflicts with any trait in a selection."""
+        return bool(self.conflict_mask(self.id_masks[trait_id]) & self.mask_of(trait_ids))
+
+    def is_compatible(self, trait_ids):
+        """Check that no two traits in a selection conflict."""
+        mask = self.mask_of(trait_ids)
+        return not self.conflict_mask(mask) & mask
+
+    def compatible_mask(self, trait_ids, candidates=None):
+        """Return the bitset of traits that can be added to a selection."""
+        mask = self.mask_of(trait_ids)
+        allowed = self.all_mask if candidates is None else candidates
+        return allowed & ~mask & ~self.conflict_mask(mask)
+
+    def compatible_with(self, trait_ids, category=None, pack=None):
+        """Return the IDs of every trait compatible with a selection."""
+        candidates = self.all_mask
+        if category is not None:
+            candidates &= self.categories.get(category, 0)
+        if pack is not None:
+            candidates &= self.packs.get(pack, 0)
+        return self.ids_of(self.compatible_mask(trait_ids, candidates))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query trait compatibility with bitmasks.")
+    parser.add_argument("--index", help="trait index sidecar (default: build from traits.json)")
+    parser.add_argument("--category")
+    parser.add_argument("--pack")
+    parser.add_argument("traits", nargs="*", help="current trait selection")
+    args = parser.parse_args()
+
+    index = TraitIndex.load(args.index) if args.index else TraitIndex.from_traits_file()
+    if not index.is_compatible(args.traits):
+        print(f"[ERROR] {', '.join(args.traits)} contains conflicting traits")
+        return
+    compatible = index.compatible_with(args.traits, args.category, args.pack)
+    print(f"{len(compatible)} compatible traits:")
+    for trait_id in compatible:
+        print(f"  {trait_id}")
+
+
+if __name__ == "__main__":
+    main()
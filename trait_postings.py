@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Inverted indexes and conflict adjacency for the trait browser.
+
+Traits are numbered by their rank in a stable display order (name, then ID),
+and every category and pack keeps a sorted posting list of those ranks.
+Combined filters such as "hobby AND (base_game OR growing_together) AND
+compatible with [lazy]" are answered by merging and intersecting sorted
+postings, and results come out already in display order.
+"""
+
+import argparse
+import heapq
+import os
+from bisect import bisect_left
+
+from asset_io import INDEX_DIR, load_json, write_json
+from trait_index import TRAITS_PATH
+
+POSTINGS_PATH = os.path.join(INDEX_DIR, "traits_postings.json")
+POSTINGS_VERSION = 1
+
+
+def build_trait_postings(traits):
+    """Build the serializable postings sidecar for a list of trait dictionaries."""
+    # Stable display order; the original position breaks ties between duplicate IDs
+    order = sorted(range(len(traits)), key=lambda position: (traits[position]["name"].lower(),
+                                                             traits[position]["id"], position))
+    ranks = {position: rank for rank, position in enumerate(order)}
+    ranks_by_id = {}
+    for position, trait in enumerate(traits):
+        ranks_by_id.setdefault(trait["id"], []).append(ranks[position])
+
+    categories = {}
+    packs = {}
+    adjacency = [set() for _ in traits]
+    for rank, position in enumerate(order):
+        trait = traits[position]
+        categories.setdefault(trait["category"], []).append(rank)
+        packs.setdefault(trait["pack"], []).append(rank)
+        for other_id in trait.get("conflictingTraits", []):
+            for other_rank in ranks_by_id.get(other_id, []):
+                adjacency[rank].add(other_rank)
+                adjacency[other_rank].add(rank)
+
+    return {
+        "version": POSTINGS_VERSION,
+        "ids": [traits[position]["id"] for position in order],
+        "positions": order,
+        "categories": categories,
+        "packs": packs,
+        "conflicts": [sorted(neighbours) for neighbours in adjacency]
+    }
+
+
+def write_trait_postings(traits, postings_path=POSTINGS_PATH):
+    """Build and write the postings sidecar; returns the sidecar data."""
+    data = build_trait_postings(traits)
+    os.makedirs(os.path.dirname(postings_path), exist_ok=True)
+    write_json(postings_path, data, compact=True)
+    return data
+
+
+def intersect(*postings):
+    """Intersect sorted posting lists, smallest first, galloping through the larger ones."""
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        matched = []
+        low = 0
+        for value in result:
+            low = bisect_left(other, value, low)
+            if low == len(other):
+                break
+            if other[low] == value:
+                matched.append(value)
+        result = matched
+    return list(result)
+
+
+def union(*postings):
+    """Merge sorted posting lists into one sorted list without duplicates."""
+    result = []
+    for value in heapq.merge(*postings):
+        if not result or result[-1] != value:
+            result.append(value)
+    return result
+
+
+def difference(postings, excluded):
+    """Return the values of a sorted posting list that are not in another."""
+    excluded = set(excluded)
+    return [value for value in postings if value not in excluded]
+
+
+class TraitPostings:
+    """Combined category/pack/compatibility filters over sorted postings."""
+
+    def __init__(self, data):
+        if data.get("version") != POSTINGS_VERSION:
+            raise ValueError("Unsupported trait postings version")
+        self.ids = data["ids"]
+        self.categories = data["categories"]
+        self.packs = data["packs"]
+        self.conflicts = data["conflicts"]
+        self.ranks_by_id = {}
+        for rank, trait_id in enumerate(self.ids):
+            self.ranks_by_id.setdefault(trait_id, []).append(rank)
+        self.all = list(range(len(self.ids)))
+
+    @classmethod
+    def load(cls, postings_path=POSTINGS_PATH):
+        """Load the sidecar written by generate_trait_sidecars()."""
+        return cls(load_json(postings_path))
+
+    @classmethod
+    def from_traits_file(cls, traits_path=TRAITS_PATH):
+        """Build the postings in memory from a traits.json file."""
+        return cls(build_trait_postings(load_json(traits_path)["traits"]))
+
+    def category(self, *names):
+        """Postings for traits in any of the given categories."""
+        return union(*(self.categories.get(name, []) for name in names))
+
+    def pack(self, *names):
+        """Postings for traits from any of the given packs."""
+        return union(*(self.packs.get(name, []) for name in names))
+
+    def compatible_with(self, trait_ids):
+        """Postings for traits that can be added to a selection."""
+        selected = union(*(self.ranks_by_id[trait_id] for trait_id in trait_ids))
+        blocked = union(selected, *(self.conflicts[rank] for rank in selected))
+        return difference(self.all, blocked)
+
+    def query(self, categories=None, packs=None, compatible_with=None):
+        """Return trait IDs matching every given filter, in display order.
+
+        Values within categories or packs are OR'ed; the filters are AND'ed.
+        """
+        filters = []
+        if categories:
+            filters.append(self.category(*categories))
+        if packs:
+            filters.append(self.pack(*packs))
+        if compatible_with:
+            filters.append(self.compatible_with(compatible_with))
+        ranks = intersect(*filters) if filters else self.all
+        return [self.ids[rank] for rank in ranks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter traits with the postings index.")
+    parser.add_argument("--postings", help="postings sidecar (default: build from traits.json)")
+    parser.add_argument("--category", action="append", help="category to include (repeat to OR)")
+    parser.add_argument("--pack", action="append", help="pack to include (repeat to OR)")
+    parser.add_argument("--compatible-with", nargs="+", default=[], help="current trait selection")
+    args = parser.parse_args()
+
+    postings = TraitPostings.load(args.postings) if args.postings else TraitPostings.from_traits_file()
+    results = postings.query(args.category, args.pack, args.compatible_with)
+    print(f"{len(results)} matching traits:")
+    for trait_id in results:
+        print(f"  {trait_id}")
+
+
+if __name__ == "__main__":
+    main()